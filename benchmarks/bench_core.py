@@ -0,0 +1,164 @@
+"""
+Benchmarks of the hot paths of the simulator.
+"""
+
+import numpy as np
+
+from run_benchmarks import benchmark
+
+from bloch_simulator.decomposition import quaternions, zyz_angles
+from bloch_simulator.gate import Gate, quaternion_product
+from bloch_simulator.gate_batch import GateBatch
+from bloch_simulator.gate_index import GateIndex
+from bloch_simulator.metrics import gate_fidelity, state_fidelity
+from bloch_simulator.state_batch import StateBatch
+from bloch_simulator.state import State
+from bloch_simulator.streaming import stream_trajectory
+
+# a gate that is not one of the named ones, so that no shortcut applies
+_MATRIX = Gate.from_rotation(np.array([1, 2, 3]), 1.234).U
+
+
+@benchmark()
+def gate_apply():
+    gate, state = Gate(_MATRIX), State("|+>")
+    return lambda: gate.apply(state)
+
+
+@benchmark()
+def gate_apply_in_place():
+    gate, state = Gate(_MATRIX), State("|+>")
+    return lambda: gate.apply_(state)
+
+
+@benchmark()
+def gate_rotation_axis_and_angle():
+    # a new gate every time, since the decomposition is cached on the gate
+    return lambda: (lambda gate: (gate.rotation_axis, gate.rotation_angle))(
+        Gate(_MATRIX)
+    )
+
+
+@benchmark()
+def gate_rotation_axis_cached():
+    gate = Gate(_MATRIX)
+    return lambda: gate.rotation_axis
+
+
+@benchmark()
+def gate_from_rotation():
+    axis = np.array([1.0, 2.0, 3.0])
+    return lambda: Gate.from_rotation(axis, 1.234)
+
+
+@benchmark(backend=["matrix", "quaternion"])
+def gate_compose_chain(backend):
+    # 100 gates composed one after the other, e.g. the gates of a circuit
+    rng = np.random.default_rng(0)
+    gates = [
+        Gate.from_rotation(axis, angle, backend=backend)
+        for axis, angle in zip(rng.normal(size=(100, 3)), rng.uniform(0, np.pi, 100))
+    ]
+
+    def compose():
+        product = gates[0]
+        for gate in gates[1:]:
+            product = gate @ product
+        return product
+
+    return compose
+
+
+@benchmark(backend=["matrix", "quaternion"])
+def gate_compose_batch(backend):
+    # 100000 pairs of gates composed at once
+    rng = np.random.default_rng(0)
+    a, b = (
+        GateBatch.from_rotation(rng.normal(size=(100_000, 3)), rng.uniform(0, np.pi, 100_000))
+        for _ in range(2)
+    )
+
+    if backend == "matrix":
+        return lambda: a.matrices @ b.matrices
+
+    p, q = quaternions(a), quaternions(b)
+    return lambda: quaternion_product(p, q)
+
+
+@benchmark(n_points=[10, 100, 1000, 100_000])
+def gate_calculate_trajectory(n_points):
+    gate, state = Gate(_MATRIX), State("|0>")
+    return lambda: gate.calculate_trajectory(state, n_points)
+
+
+@benchmark(angle=[0.01, 3.0])
+def gate_calculate_adaptive_trajectory(angle):
+    gate, state = Gate.from_rotation(np.array([1, 2, 3]), angle), State("|0>")
+    return lambda: gate.calculate_adaptive_trajectory(state)
+
+
+@benchmark()
+def state_bloch_coordinates():
+    state = State(np.array([0.6, 0.8j]))
+    return lambda: state.bloch_coordinates
+
+
+@benchmark()
+def state_bloch_coordinates_out():
+    state, out = State(np.array([0.6, 0.8j])), np.empty(3)
+    return lambda: state.get_bloch_coordinates(out=out)
+
+
+@benchmark(k=[1, 1000, 100_000])
+def zyz_angles_stack(k):
+    matrices = GateBatch.from_rotation(
+        np.random.default_rng(0).normal(size=(k, 3)), np.linspace(0, np.pi, k)
+    ).matrices
+    return lambda: zyz_angles(matrices)
+
+
+@benchmark(k=[1000, 100_000])
+def state_fidelity_batch(k):
+    rng = np.random.default_rng(0)
+    a, b = (
+        StateBatch(rng.normal(size=(k, 2)) + 1j * rng.normal(size=(k, 2)))
+        for _ in range(2)
+    )
+    return lambda: state_fidelity(a, b)
+
+
+@benchmark(k=[1000, 100_000])
+def gate_fidelity_batch(k):
+    rng = np.random.default_rng(0)
+    a, b = (
+        GateBatch.from_rotation(rng.normal(size=(k, 3)), rng.uniform(0, np.pi, k))
+        for _ in range(2)
+    )
+    return lambda: gate_fidelity(a, b)
+
+
+@benchmark(library_size=[10_000, 1_000_000])
+def gate_index_query(library_size):
+    rng = np.random.default_rng(0)
+    index = GateIndex(
+        GateBatch.from_rotation(
+            rng.normal(size=(library_size, 3)), rng.uniform(0, np.pi, library_size)
+        )
+    )
+    gate = Gate(_MATRIX)
+    return lambda: index.query(gate, k=5)
+
+
+@benchmark(n_gates=[10_000, 1_000_000])
+def stream_trajectory_array(n_gates):
+    rng = np.random.default_rng(0)
+    matrices = GateBatch.from_rotation(
+        rng.normal(size=(n_gates, 3)), rng.uniform(0, np.pi, n_gates)
+    ).matrices
+    state = State("|0>")
+
+    def consume():
+        for _ in stream_trajectory(matrices, state):
+            pass
+
+    return consume
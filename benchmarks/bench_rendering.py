@@ -0,0 +1,53 @@
+"""
+Benchmarks of drawing the Bloch sphere with the Agg backend (the same figure as the application).
+"""
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from run_benchmarks import benchmark
+
+from bloch_figure import draw_bloch_figure, update_bloch_figure, APP_FIGURE_STYLE
+from history import History
+
+from bloch_simulator.gate import Gate
+from bloch_simulator.state import State
+
+_HISTORY_LENGTHS = [0, 1, 4, 64]
+
+
+def _history(length: int) -> History:
+    history = History()
+    state = State("|0>")
+
+    for i in range(length):
+        gate = Gate(["H", "T", "X", "S"][i % 4])
+        history.push(gate, state)
+        state = gate(state)
+
+    return history
+
+
+@benchmark(history_length=_HISTORY_LENGTHS)
+def draw_bloch_figure_agg(history_length):
+    history = _history(history_length)
+    gate, state = Gate("H"), State("|0>")
+
+    def draw():
+        scene = draw_bloch_figure(gate, state, history, **APP_FIGURE_STYLE)
+        FigureCanvasAgg(scene["fig"]).draw()
+
+    return draw
+
+
+@benchmark(history_length=_HISTORY_LENGTHS)
+def update_bloch_figure_agg(history_length):
+    history = _history(history_length)
+    gate, state = Gate("H"), State("|0>")
+    scene = draw_bloch_figure(gate, state, history, **APP_FIGURE_STYLE)
+    canvas = FigureCanvasAgg(scene["fig"])
+
+    def update():
+        update_bloch_figure(scene, gate, state, history)
+        canvas.draw()
+
+    return update
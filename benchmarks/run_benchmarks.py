@@ -0,0 +1,254 @@
+"""
+Run the benchmarks of the simulator and the rendering path, store the results as JSON and compare them with a baseline.
+
+Every benchmark is a function, which does its setup and returns the callable that is timed. The parameterized ones
+are run once for every value. The results are saved into benchmarks/results/<commit>.json (machine specific,
+so they are not committed), and a comparison fails (exit code 1) if a benchmark got slower than the threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py                          run everything, save the results of this commit
+    python benchmarks/run_benchmarks.py -k trajectory            only the benchmarks whose name contains "trajectory"
+    python benchmarks/run_benchmarks.py --compare HEAD~1         compare with the saved results of a commit (or a JSON file)
+    python benchmarks/run_benchmarks.py --compare base.json --threshold 0.1
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import os
+import os.path
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# for being able to import the simulator and the app
+sys.path.append(os.path.join(REPO_DIR, "src"))
+sys.path.append(os.path.join(REPO_DIR, "src", "app"))
+# the benchmark modules register into this module, also when it is run as a script
+sys.modules.setdefault("run_benchmarks", sys.modules[__name__])
+
+# the modules with the benchmarks, they register themselves when imported
+BENCHMARK_MODULES = ["bench_core", "bench_rendering"]
+
+# a benchmark is a regression if its best time is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.25
+
+# name -> function that takes the parameters and returns the callable to time
+_benchmarks = {}
+
+
+def benchmark(**params):
+    """
+    Register a benchmark. The keyword arguments give the values of the parameters, the benchmark is run
+    once for each value, e.g. @benchmark(n_points=[10, 1000]) (only one parameter is supported).
+    """
+
+    assert len(params) <= 1, "Only one parameter is supported."
+
+    def register(function):
+        name = f"{function.__module__.removeprefix('bench_')}.{function.__name__}"
+
+        if len(params) == 0:
+            _benchmarks[name] = function
+            return function
+
+        [(param, values)] = params.items()
+
+        for value in values:
+            _benchmarks[f"{name}[{param}={value}]"] = (
+                lambda value=value: function(**{param: value})
+            )
+
+        return function
+
+    return register
+
+
+def time_benchmark(setup, repeat: int, min_time: float) -> dict:
+    """
+    Time the callable returned by setup. The number of calls per measurement is chosen so that one
+    measurement takes at least min_time, and the measurement is repeated.
+
+    Returns:
+        dict: The best and the median time per call (in seconds), and how it was measured.
+    """
+
+    timer = timeit.Timer(setup())
+
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    times = [time / number for time in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _git(*args) -> str | None:
+    try:
+        return subprocess.run(
+            ["git", *args],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(pattern: str | None, repeat: int, min_time: float) -> dict:
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+
+    results = {}
+
+    for name, setup in _benchmarks.items():
+        if pattern is not None and pattern not in name:
+            continue
+
+        results[name] = time_benchmark(setup, repeat, min_time)
+        print(f"{name:<60} {_format_time(results[name]['min'])}")
+
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": _git("status", "--porcelain", "--untracked-files=no") not in ("", None),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "results": results,
+    }
+
+
+def load_results(baseline: str) -> dict:
+    """Load the results from a JSON file, or the saved results of a commit."""
+
+    if not os.path.isfile(baseline):
+        commit = _git("rev-parse", "--short", baseline) or baseline
+        baseline = os.path.join(RESULTS_DIR, f"{commit}.json")
+
+    with open(baseline, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Print the change of every benchmark that is in both results.
+
+    Returns:
+        list[str]: The names of the benchmarks that got slower than the threshold.
+    """
+
+    regressions = []
+
+    print()
+    print(f"Compared with {baseline.get('commit')} ({baseline.get('date')}):")
+
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        ratio = result["min"] / baseline["results"][name]["min"]
+
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            mark = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            mark = "faster"
+        else:
+            mark = ""
+
+        print(
+            f"{name:<60} {_format_time(baseline['results'][name]['min'])} -> "
+            f"{_format_time(result['min'])} {ratio:6.2f}x {mark}"
+        )
+
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:<2}"
+
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the benchmarks of the simulator and the rendering path."
+    )
+    parser.add_argument(
+        "-k", dest="pattern", help="only run the benchmarks whose name contains this"
+    )
+    parser.add_argument(
+        "--output",
+        help="the JSON file of the results (default: benchmarks/results/<commit>.json)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="do not save the results"
+    )
+    parser.add_argument(
+        "--compare", help="the baseline to compare with: a JSON file or a commit"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"the allowed slowdown, as a fraction (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="the number of measurements (default: 5)"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="the minimal length of one measurement in seconds (default: 0.05)",
+    )
+    args = parser.parse_args()
+
+    # the baseline is loaded first, so a missing one fails before the long run
+    baseline = load_results(args.compare) if args.compare is not None else None
+
+    current = run(args.pattern, args.repeat, args.min_time)
+
+    if not args.no_save:
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"{current['commit'] or 'unknown'}.json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+        print(f"\nSaved the results to {output}")
+
+    if baseline is not None:
+        regressions = compare(baseline, current, args.threshold)
+
+        if len(regressions) > 0:
+            print(
+                f"\n{len(regressions)} benchmark(s) got more than {args.threshold:.0%} slower."
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
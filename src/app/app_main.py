@@ -1,12 +1,46 @@
+import time
+
+_start = time.perf_counter()
+
+import sys
+
+# (name, seconds since start) for --profile-startup
+startup_marks = []
+
+
+def mark(name):
+    startup_marks.append((name, time.perf_counter() - _start))
+
+
 from tkinter import *
 from customtkinter import *
-from bloch_frame import render_bloch_frame
+
+mark("import tkinter, customtkinter")
+
 from settings_bar_frame import render_settings_bar_frame
 
+mark("import numpy, simulator, settings bar")
+
+profile_startup = "--profile-startup" in sys.argv[1:]
+
 root = CTk()
 
-render_bloch_frame(root)
-render_settings_bar_frame(root, lambda: render_bloch_frame(root))
+# the Bloch sphere needs matplotlib, which is slow to import, so the window is shown with a placeholder first
+bloch_container = CTkFrame(master=root, width=700, height=700)
+bloch_container.pack(side=LEFT, fill="both", expand=True)
+loading_label = CTkLabel(master=bloch_container, text="Loading the Bloch sphere...")
+loading_label.place(relx=0.5, rely=0.5, anchor=CENTER)
+
+render_bloch_frame = None
+
+
+def rerender_bloch_frame():
+    # until the Bloch sphere is loaded, there is nothing to rerender, it is drawn from the current state once loaded
+    if render_bloch_frame is not None:
+        render_bloch_frame(bloch_container)
+
+
+render_settings_bar_frame(root, rerender_bloch_frame)
 
 
 def center_window(window):
@@ -23,5 +57,45 @@ center_window(root)
 
 root.wm_title("Bloch sphere simulator")
 
+mark("build window shell")
+
+
+def load_bloch_frame():
+    global render_bloch_frame
+
+    # make sure the window shell is on the screen before the slow part
+    root.update()
+
+    mark("first paint (window shell)")
+
+    from bloch_frame import render_bloch_frame as _render_bloch_frame
+
+    mark("import matplotlib, bloch frame")
+
+    loading_label.destroy()
+    render_bloch_frame = _render_bloch_frame
+    render_bloch_frame(bloch_container)
+    root.update_idletasks()
+
+    mark("first paint (Bloch sphere)")
+
+    if profile_startup:
+        print_startup_profile()
+        root.after(0, root.destroy)
+
+
+def print_startup_profile():
+    print("Startup profile:")
+
+    previous = 0
+    for name, elapsed in startup_marks:
+        print(f"  {name:<40} {(elapsed - previous) * 1000:8.1f} ms")
+        previous = elapsed
+
+    print(f"  {'total':<40} {previous * 1000:8.1f} ms")
+
+
+# runs once the main loop has drawn the window
+root.after(1, load_bloch_frame)
 
 root.mainloop()
@@ -1,4 +1,3 @@
-from collections import deque
 import sys
 import os.path
 import numpy as np
@@ -10,25 +9,15 @@ sys.path.append(
 
 from bloch_simulator.gate import Gate
 from bloch_simulator.state import State
-
-previous_inputs = {
-    "unitary_matrix": [""] * 4,
-    "state": [""] * 2,
-}
+from history import History
 
 gate = Gate("X")
 state = State("|0>")
 
-MAX_HISTORY_LENGTH = 4
-
 def update_state(new_state: State | np.ndarray, update_history: bool = False):
     
     if update_history:
-        history.append({
-            # copy the current state
-            "gate": Gate(gate),
-            "state": State(state)
-        })
+        history.push(gate, state)
     
     if isinstance(new_state, State):
         state.set_state(new_state.state)
@@ -38,22 +27,27 @@ def update_state(new_state: State | np.ndarray, update_history: bool = False):
 def update_gate(new_gate: Gate | str, update_history: bool = False):
     
     if update_history :
-        history.append({
-            # copy the current state
-            "gate": Gate(gate),
-            "state": State(state)
-        })
+        history.push(gate, state)
     
     if isinstance(new_gate, Gate):
         gate.set_matrix(new_gate.U)
     else:
         gate.set_matrix(new_gate)
 
-def reset_last_app_state():
-    if len(history) > 0:
-        previous_state = history.pop()
+def _restore_app_state(step):
+    if step is not None:
+        matrix, vector = step
         
-        update_gate(Gate(previous_state["gate"]))
-        update_state(State(previous_state["state"]))    
+        update_gate(matrix)
+        update_state(vector)
+
+def reset_last_app_state():
+    _restore_app_state(history.undo(gate, state))
+
+def redo_app_state():
+    _restore_app_state(history.redo(gate, state))
+
+def jump_to_app_state(step: int):
+    _restore_app_state(history.jump(step, gate, state))
 
-history = deque(maxlen=MAX_HISTORY_LENGTH)
+history = History()
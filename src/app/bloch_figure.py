@@ -0,0 +1,222 @@
+import numpy as np
+from matplotlib.figure import Figure
+
+from history import History
+
+import sys
+import os.path
+
+# for being able to import from src
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+from bloch_simulator.state import State
+from bloch_simulator.gate import Gate
+
+# this module does not depend on tkinter, so it can be used to render without a window
+
+HISTORY_COLOR = (0.7, 0.3, 0)
+TO_COLOR = (1, 1, 0, 0.5)
+FROM_COLOR = (1, 0, 0, 1)
+
+# number of history steps drawn on the sphere
+VISIBLE_HISTORY_LENGTH = 4
+
+# the most points of all the trajectories of the scene together (the current one and the history lines),
+# each of them is sampled adaptively (see Gate.calculate_adaptive_trajectory) and gets an equal share at most
+MAX_SCENE_TRAJECTORY_POINTS = 1000
+
+# the style of the figure in the application
+APP_FIGURE_STYLE = {
+    "figsize": (7, 7),
+    "figure_background_color": "#202020",
+    "path_color": "magenta",
+    "rotation_axis_color": "cyan",
+    "from_arrow_color": FROM_COLOR,
+    "to_arrow_color": TO_COLOR,
+}
+
+def draw_bloch_figure(
+    gate: Gate,
+    state: State,
+    history: History,
+    figsize=(7, 7),
+    figure_background_color="#202020",
+    figure_foreground_color="white",
+    from_arrow_color="red",
+    to_arrow_color="green",
+    rotation_axis_color="blue",
+    path_color="blue",
+    elevation=30,
+    azimuth=-45,
+):
+    """
+    Build the figure of the Bloch sphere. The static parts (sphere, axes, legend) are drawn once,
+    the parts that depend on the gate, the state and the history are drawn by update_bloch_figure.
+
+    Returns:
+        dict: The scene, which holds the figure and the artists that update_bloch_figure changes.
+    """
+
+    fig = Figure(figsize=figsize, dpi=100)
+
+    ax = fig.add_subplot(111, projection="3d")
+
+    fig.patch.set_facecolor(figure_background_color)
+
+    ax.set_facecolor(figure_background_color)
+    # set foreground color
+    ax.xaxis.label.set_color(figure_foreground_color)
+    ax.yaxis.label.set_color(figure_foreground_color)
+    ax.zaxis.label.set_color(figure_foreground_color)
+    ax.xaxis.set_pane_color((0.1, 0.1, 0.1, 0.0))
+    ax.yaxis.set_pane_color((0.1, 0.1, 0.1, 0.0))
+    ax.zaxis.set_pane_color((0.1, 0.1, 0.1, 0.0))
+    ax.tick_params(axis="x", colors=figure_foreground_color)
+    ax.tick_params(axis="y", colors=figure_foreground_color)
+    ax.tick_params(axis="z", colors=figure_foreground_color)
+    ax.grid(False)
+    ax.xaxis._axinfo["grid"]["color"] = figure_foreground_color
+    ax.yaxis._axinfo["grid"]["color"] = figure_foreground_color
+    ax.zaxis._axinfo["grid"]["color"] = figure_foreground_color
+    ax.xaxis._axinfo["tick"]["color"] = figure_foreground_color
+    ax.yaxis._axinfo["tick"]["color"] = figure_foreground_color
+    ax.zaxis._axinfo["tick"]["color"] = figure_foreground_color
+    ax.xaxis._axinfo["axisline"]["linewidth"] = 1
+    ax.yaxis._axinfo["axisline"]["linewidth"] = 1
+    ax.zaxis._axinfo["axisline"]["linewidth"] = 1
+    ax.xaxis.line.set_color((1, 1, 1, 0.5))
+    ax.yaxis.line.set_color((1, 1, 1, 0.5))
+    ax.zaxis.line.set_color((1, 1, 1, 0.5))
+
+    def draw_wireframe_sphere(figure_foreground_color, ax):
+        num_lines_in_wireframe = 30
+
+        # draw the bloch sphere
+        u = np.linspace(0, 2 * np.pi, num_lines_in_wireframe)
+        v = np.linspace(0, np.pi, num_lines_in_wireframe)
+        x = np.outer(np.cos(u), np.sin(v))
+        y = np.outer(np.sin(u), np.sin(v))
+        z = np.outer(np.ones(np.size(u)), np.cos(v))
+        ax.plot_wireframe(x, y, z, color=figure_foreground_color, alpha=0.1)
+
+    draw_wireframe_sphere(figure_foreground_color, ax)
+
+    ax.set_xlabel("X", fontsize=15)
+    ax.set_ylabel("Y", fontsize=15)
+    ax.set_zlabel("Z", fontsize=15)
+    ax.set_xlim(-1, 1)
+    ax.set_ylim(-1, 1)
+    ax.set_zlim(-1, 1)
+    ax.set_xticks([-1, 0, 1])
+    ax.set_yticks([-1, 0, 1])
+    ax.set_zticks([-1, 0, 1])
+
+    ax.set_box_aspect([1, 1, 1])
+    ax.set_aspect("equal")
+    ax.set_title(f"Bloch sphere", color=figure_foreground_color, fontsize=20)
+
+    ax.view_init(elev=elevation, azim=azimuth)
+
+    [line] = ax.plot([], [], [], color=path_color, lw=3, linestyle="-")
+
+    scene = {
+        "fig": fig,
+        "ax": ax,
+        "line": line,
+        "quivers": [],
+        "history_lines": [],
+        "points": None,
+        "from_arrow_color": from_arrow_color,
+        "to_arrow_color": to_arrow_color,
+        "rotation_axis_color": rotation_axis_color,
+    }
+
+    update_bloch_figure(scene, gate, state, history)
+
+    # the legend only copies the style of the arrows, so it stays valid when they are redrawn
+    leg = ax.legend(
+        loc="upper center", fancybox=True, bbox_to_anchor=(0.5, -0.05), ncol=4
+    )
+    leg.get_frame().set_facecolor(figure_background_color)
+    leg.get_frame().set_linewidth(0)
+
+    for text in leg.get_texts():
+        text.set_color(figure_foreground_color)
+
+    return scene
+
+
+def update_bloch_figure(
+    scene: dict,
+    gate: Gate,
+    state: State,
+    history: History,
+):
+    """
+    Update the arrows, the history lines and the trajectory of an existing scene, without rebuilding the figure.
+    """
+
+    ax = scene["ax"]
+
+    p_from = state.bloch_coordinates
+    p_to = gate(state).bloch_coordinates
+
+    # quivers cannot be moved, but they are cheap to replace
+    for quiver in scene["quivers"]:
+        quiver.remove()
+
+    scene["quivers"] = [
+        ax.quiver(
+            0, 0, 0, *p_from, color=scene["from_arrow_color"], label="Initial State", lw=3
+        ),
+        ax.quiver(
+            0, 0, 0, *p_to, color=scene["to_arrow_color"], label="Final State", lw=3
+        ),
+        ax.quiver(
+            0,
+            0,
+            0,
+            *(gate.rotation_axis / np.linalg.norm(gate.rotation_axis)),
+            color=scene["rotation_axis_color"],
+            label="Rotation Axis",
+            alpha=0.5,
+            linestyle="--",
+            lw=3,
+        ),
+    ]
+
+    history_lines = scene["history_lines"]
+    # only the last few steps are drawn, the trajectories were computed when they were pushed
+    trajectories = history.recent_trajectories(VISIBLE_HISTORY_LENGTH)
+    num_history_lines = len(trajectories)
+    max_points = MAX_SCENE_TRAJECTORY_POINTS // (num_history_lines + 1)
+
+    while len(history_lines) > num_history_lines:
+        history_lines.pop().remove()
+
+    while len(history_lines) < num_history_lines:
+        [history_line] = ax.plot([], [], [], linestyle="--", lw=3)
+        history_lines.append(history_line)
+
+    for i, (history_line, trajectory) in enumerate(zip(history_lines, trajectories)):
+        min_alpha = 0.3
+        alpha = min_alpha + ((i + 1) / (num_history_lines)) * (1 - min_alpha)
+        history_line.set_data_3d(*_limit_points(trajectory, max_points))
+        history_line.set_color((*HISTORY_COLOR, alpha))
+
+    # one row per point, so that the animation can slice the first i points
+    scene["points"] = gate.calculate_adaptive_trajectory(
+        state, max_points=max_points
+    ).T
+    scene["line"].set_data_3d([], [], [])
+
+
+def _limit_points(trajectory: np.ndarray, max_points: int) -> np.ndarray:
+    """Keep at most max_points of the columns of a trajectory, evenly spaced and including both ends."""
+
+    if trajectory.shape[1] <= max_points:
+        return trajectory
+
+    return trajectory[:, np.linspace(0, trajectory.shape[1] - 1, max_points).round().astype(int)]
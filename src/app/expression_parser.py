@@ -0,0 +1,303 @@
+"""
+A small, safe parser for the complex expressions typed into the text boxes, e.g. "sqrt(2)/2 + i*sin(pi/4)".
+
+Expressions are compiled once into a tree of Python closures and kept in an LRU cache keyed by the raw string,
+so evaluating the same text again is only a function call. Unlike eval, only numbers, the operators + - * / **,
+parentheses, the imaginary unit (i or j, also as a suffix: 2i), the constants below and the functions below are allowed.
+Any other name is a variable, whose value (a number or a numpy array) has to be given when evaluating.
+"""
+
+from functools import lru_cache
+import re
+import numpy as np
+
+# the complex versions are used, so that e.g. sqrt(-1) is i instead of nan
+FUNCTIONS = {
+    "sqrt": np.emath.sqrt,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "log": np.emath.log,
+    "abs": np.abs,
+    "conj": np.conj,
+}
+
+CONSTANTS = {
+    "pi": np.pi,
+    "e": np.e,
+    "i": 1j,
+    "j": 1j,
+}
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?[ij]?)
+    | (?P<name>[A-Za-z_][A-Za-z_0-9]*(?:\.[A-Za-z_][A-Za-z_0-9]*)?)
+    | (?P<operator>\*\*|[-+*/(),])
+    """,
+    re.VERBOSE,
+)
+
+
+class ExpressionError(ValueError):
+    """
+    An error in an expression, with the position (index in the text) where it was found.
+    """
+
+    def __init__(self, message: str, position: int):
+        super().__init__(f"{message} (at position {position})")
+        self.message = message
+        self.position = position
+
+
+def _tokenize(text: str) -> list[tuple[str, str, int]]:
+    tokens = []
+    position = 0
+
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+
+        if match is None:
+            raise ExpressionError(f"Unexpected character '{text[position]}'", position)
+
+        if match.lastgroup != "space":
+            tokens.append((match.lastgroup, match.group(), position))
+
+        position = match.end()
+
+    tokens.append(("end", "", len(text)))
+
+    return tokens
+
+
+def _number(text: str) -> complex:
+    if text[-1] in "ij":
+        return complex(0, float(text[:-1]))
+
+    return complex(float(text))
+
+
+class _Parser:
+    """
+    Recursive descent parser, which builds (evaluate, is_constant) pairs directly.
+    Constant subexpressions are computed right away, so they cost nothing when evaluated.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.index = 0
+        self.variables = set()
+
+    @property
+    def token(self) -> tuple[str, str, int]:
+        return self.tokens[self.index]
+
+    def advance(self) -> tuple[str, str, int]:
+        token = self.token
+        self.index += 1
+        return token
+
+    def expect(self, value: str):
+        kind, text, position = self.advance()
+
+        if text != value or kind != "operator":
+            found = "the end" if kind == "end" else f"'{text}'"
+            raise ExpressionError(f"Expected '{value}' instead of {found}", position)
+
+    def parse(self):
+        node = self.expression()
+
+        kind, text, position = self.token
+        if kind != "end":
+            raise ExpressionError(f"Unexpected '{text}'", position)
+
+        return node
+
+    def expression(self):
+        node = self.term()
+
+        while self.token[1] in ("+", "-") and self.token[0] == "operator":
+            _, operator, position = self.advance()
+            node = self.binary(operator, node, self.term(), position)
+
+        return node
+
+    def term(self):
+        node = self.unary()
+
+        while self.token[1] in ("*", "/") and self.token[0] == "operator":
+            _, operator, position = self.advance()
+            node = self.binary(operator, node, self.unary(), position)
+
+        return node
+
+    def unary(self):
+        if self.token[1] in ("+", "-") and self.token[0] == "operator":
+            _, operator, position = self.advance()
+            operand = self.unary()
+
+            if operator == "+":
+                return operand
+
+            return self.binary("-", _constant(0), operand, position)
+
+        return self.power()
+
+    def power(self):
+        node = self.atom()
+
+        if self.token[1] == "**" and self.token[0] == "operator":
+            _, operator, position = self.advance()
+            # right associative, and binds tighter than a unary minus on its left: -2**2 = -4
+            node = self.binary(operator, node, self.unary(), position)
+
+        return node
+
+    def atom(self):
+        kind, text, position = self.advance()
+
+        if kind == "number":
+            return _constant(_number(text))
+
+        if kind == "operator" and text == "(":
+            node = self.expression()
+            self.expect(")")
+            return node
+
+        if kind == "name":
+            # np.sqrt, np.pi, ... are accepted for compatibility
+            name = text.removeprefix("np.")
+
+            if self.token[1] == "(" and self.token[0] == "operator":
+                return self.call(name, position)
+
+            if name in CONSTANTS:
+                return _constant(CONSTANTS[name])
+
+            if "." in name:
+                raise ExpressionError(f"Unknown name '{text}'", position)
+
+            self.variables.add(name)
+            return _variable(name, position)
+
+        found = "the end" if kind == "end" else f"'{text}'"
+        raise ExpressionError(f"Expected a number instead of {found}", position)
+
+    def call(self, name: str, position: int):
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"Unknown function '{name}'", position)
+
+        self.expect("(")
+        evaluate_argument, is_constant = self.expression()
+        self.expect(")")
+
+        function = FUNCTIONS[name]
+
+        if is_constant:
+            return _constant(function(evaluate_argument(None)))
+
+        return (lambda variables: function(evaluate_argument(variables))), False
+
+    def binary(self, operator: str, left, right, position: int):
+        evaluate_left, left_is_constant = left
+        evaluate_right, right_is_constant = right
+
+        operation = _OPERATIONS[operator]
+
+        def evaluate(variables):
+            try:
+                return operation(evaluate_left(variables), evaluate_right(variables))
+            except (ZeroDivisionError, OverflowError) as e:
+                raise ExpressionError(str(e).capitalize(), position) from e
+
+        if left_is_constant and right_is_constant:
+            return _constant(evaluate(None))
+
+        return evaluate, False
+
+
+_OPERATIONS = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+    "**": lambda a, b: a**b,
+}
+
+
+def _constant(value):
+    return (lambda variables: value), True
+
+
+def _variable(name: str, position: int):
+    def evaluate(variables):
+        if variables is None or name not in variables:
+            raise ExpressionError(f"Unknown name '{name}'", position)
+
+        return variables[name]
+
+    return evaluate, False
+
+
+class CompiledExpression:
+    """
+    A parsed expression, which can be evaluated many times (and for arrays of variable values).
+    """
+
+    def __init__(self, text: str):
+        parser = _Parser(text)
+
+        try:
+            self._evaluate, self.is_constant = parser.parse()
+        except RecursionError:
+            # e.g. thousands of nested parentheses
+            raise ExpressionError(
+                "The expression is nested too deeply", parser.token[2]
+            ) from None
+
+        self.text = text
+        self.variables = frozenset(parser.variables)
+
+    def __call__(self, **variables) -> complex | np.ndarray:
+        """
+        Evaluate the expression. Array variables are broadcast, so the result is an array.
+
+        Raises:
+            ExpressionError: If a variable is missing or the evaluation fails (e.g. division by zero, or too deep nesting).
+        """
+
+        try:
+            result = self._evaluate(variables)
+        except RecursionError:
+            # the closures of a very long chain of operations call each other
+            raise ExpressionError("The expression is nested too deeply", 0) from None
+
+        if isinstance(result, np.ndarray):
+            return result.astype(complex)
+
+        return complex(result)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> CompiledExpression:
+    """
+    Parse an expression, or return it from the cache if the same text was parsed before.
+
+    Raises:
+        ExpressionError: If the expression is invalid (or nested too deeply).
+    """
+
+    return CompiledExpression(text)
+
+
+def evaluate_expression(text: str, **variables) -> complex | np.ndarray:
+    """
+    Evaluate an expression, compiling it only the first time.
+
+    Raises:
+        ExpressionError: If the expression is invalid or cannot be evaluated.
+    """
+
+    return compile_expression(text)(**variables)
@@ -0,0 +1,167 @@
+import sys
+import os.path
+import numpy as np
+
+# for being able to import from src
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+from bloch_simulator.gate import (
+    Gate,
+    DEFAULT_TRAJECTORY_MAX_POINTS,
+    DEFAULT_TRAJECTORY_TOLERANCE,
+)
+from bloch_simulator.state import State
+
+# one step of the timeline: the gate and the state at that point
+STEP_DTYPE = np.dtype([("gate", complex, (2, 2)), ("state", complex, (2,))])
+
+
+class History:
+    """
+    Undo/redo timeline of (gate, state) snapshots, stored in a preallocated structured array
+    that doubles its capacity when it is full.
+
+    The steps before the cursor can be undone, the steps after it can be redone.
+    The slot at the cursor belongs to the live gate and state, it is written when the cursor moves away from it.
+    """
+
+    def __init__(
+        self,
+        trajectory_tolerance: float = DEFAULT_TRAJECTORY_TOLERANCE,
+        trajectory_max_points: int = DEFAULT_TRAJECTORY_MAX_POINTS,
+        initial_capacity: int = 64,
+        max_cached_trajectories: int = 256,
+    ):
+        self._steps = np.empty(initial_capacity, dtype=STEP_DTYPE)
+        self._cursor = 0
+        # number of valid slots, including the redo steps
+        self._length = 0
+        # the trajectories are sampled adaptively, see Gate.calculate_adaptive_trajectory
+        self._trajectory_tolerance = trajectory_tolerance
+        self._trajectory_max_points = trajectory_max_points
+        # trajectories are only kept for the steps that have been drawn or pushed
+        self._trajectories = {}
+        self._max_cached_trajectories = max_cached_trajectories
+
+    def __len__(self) -> int:
+        """Return the number of steps that can be undone."""
+        return self._cursor
+
+    @property
+    def cursor(self) -> int:
+        return self._cursor
+
+    @property
+    def num_steps(self) -> int:
+        """Return the number of stored steps, including the live slot and the steps that can be redone."""
+        return max(self._length, self._cursor + 1)
+
+    @property
+    def can_redo(self) -> bool:
+        return self._cursor + 1 < self._length
+
+    @property
+    def bytes_per_step(self) -> int:
+        return STEP_DTYPE.itemsize
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory allocated for the steps (the capacity, not only the used part)."""
+        return self._steps.nbytes
+
+    def _write(self, index: int, gate: Gate, state: State):
+        if index >= len(self._steps):
+            grown = np.empty(2 * len(self._steps), dtype=STEP_DTYPE)
+            grown[: len(self._steps)] = self._steps
+            self._steps = grown
+
+        self._steps[index]["gate"] = gate.U
+        self._steps[index]["state"] = state.state
+        self._trajectories.pop(index, None)
+
+    def push(self, gate: Gate, state: State):
+        """Save the live gate and state as a new step, which drops the steps that could be redone."""
+
+        self._write(self._cursor, gate, state)
+        self._cache_trajectory(self._cursor)
+        self._cursor += 1
+        self._length = self._cursor
+
+    def jump(
+        self, step: int, gate: Gate, state: State
+    ) -> tuple[np.ndarray, np.ndarray] | None:
+        """
+        Move the cursor to a step. The live gate and state are saved first, so they can be returned to.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray] | None: The matrix and the state vector of the step, or None if it does not exist.
+        """
+
+        if step < 0 or step >= self.num_steps or step == self._cursor:
+            return None
+
+        self._write(self._cursor, gate, state)
+        self._length = self.num_steps
+        self._cursor = step
+
+        return self._steps[step]["gate"].copy(), self._steps[step]["state"].copy()
+
+    def undo(self, gate: Gate, state: State) -> tuple[np.ndarray, np.ndarray] | None:
+        return self.jump(self._cursor - 1, gate, state)
+
+    def redo(self, gate: Gate, state: State) -> tuple[np.ndarray, np.ndarray] | None:
+        if not self.can_redo:
+            return None
+
+        return self.jump(self._cursor + 1, gate, state)
+
+    def _cache_trajectory(self, index: int):
+        self._trajectories[index] = self._compute_trajectory(index)
+        self._prune_trajectories()
+
+    def _prune_trajectories(self, keep: range = range(0)):
+        """Drop the cached trajectories far from the cursor, except the steps in keep, once there are too many."""
+
+        if len(self._trajectories) <= self._max_cached_trajectories:
+            return
+
+        # keep the memory bounded, only the steps around the cursor are drawn
+        window = self._max_cached_trajectories // 4
+        self._trajectories = {
+            i: trajectory
+            for i, trajectory in self._trajectories.items()
+            if abs(i - self._cursor) <= window or i in keep
+        }
+
+    def _compute_trajectory(self, index: int) -> np.ndarray:
+        step = self._steps[index]
+        trajectory = Gate(step["gate"].copy()).calculate_adaptive_trajectory(
+            State(step["state"].copy()),
+            self._trajectory_tolerance,
+            self._trajectory_max_points,
+        )
+        trajectory.flags.writeable = False
+
+        return trajectory
+
+    def recent_trajectories(self, count: int) -> list[np.ndarray]:
+        """
+        Return the trajectories of the last (at most) count steps that can be undone, oldest first.
+        Only these steps are touched, however long the timeline is.
+        """
+
+        steps = range(max(self._cursor - count, 0), self._cursor)
+        trajectories = []
+
+        for index in steps:
+            if index not in self._trajectories:
+                self._trajectories[index] = self._compute_trajectory(index)
+
+            trajectories.append(self._trajectories[index])
+
+        # the requested steps are pruned last, they are likely to be drawn again
+        self._prune_trajectories(keep=steps)
+
+        return trajectories
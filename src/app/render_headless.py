@@ -0,0 +1,237 @@
+"""
+Render the Bloch sphere for every step of a gate sequence, without opening a window.
+
+The input is a text file, with one command per line (empty lines and lines starting with # are skipped):
+
+    state |+>                 set the state by name (0, 1, +, - or |0>, |1>, |+>, |->)
+    state 0.6 0.8j            or by its two amplitudes
+    gate H                    apply a gate by name (I, X, Y, Z, H, S, T, S^†, T^†)
+    gate 0 1 1 0              or by its matrix entries, row by row
+
+Every gate line becomes one frame, which shows the gate applied to the current state (like the APPLY GATE button)
+together with the previous steps. The frames are rendered in parallel and written as PNG files, or piped to ffmpeg.
+
+Usage:
+    python render_headless.py sequence.txt --out frames/
+    python render_headless.py sequence.txt --video sequence.mp4 --fps 2
+"""
+
+import argparse
+import io
+import os
+import os.path
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from bloch_figure import (
+    draw_bloch_figure,
+    update_bloch_figure,
+    APP_FIGURE_STYLE,
+    TO_COLOR,
+    VISIBLE_HISTORY_LENGTH,
+)
+from history import History
+
+# for being able to import from src
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+)
+
+from bloch_simulator.gate import Gate
+from bloch_simulator.state import State
+
+
+def parse_sequence(lines) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Parse a gate sequence into the (gate matrix, state vector) pair of every frame.
+
+    Raises:
+        ValueError: If a line cannot be parsed.
+    """
+
+    state = State("|0>")
+    frames = []
+
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+
+        if line == "" or line.startswith("#"):
+            continue
+
+        command, *args = line.split()
+
+        try:
+            if command == "state":
+                if len(args) == 1:
+                    state = State(args[0])
+                else:
+                    state = State(np.array([complex(arg) for arg in args]))
+            elif command == "gate":
+                if len(args) == 1:
+                    gate = Gate(args[0])
+                else:
+                    gate = Gate(np.array([complex(arg) for arg in args]).reshape(2, 2))
+
+                frames.append((gate.U, state.state))
+                state = gate(state)
+            else:
+                raise ValueError(f"Unknown command: {command}")
+        except (ValueError, AssertionError) as e:
+            raise ValueError(f"Line {line_number}: {e}") from e
+
+    return frames
+
+
+# each worker process draws its own figure once, and only updates it for every frame
+_scene = None
+_canvas = None
+
+
+def _render_frame(
+    job: tuple[list[tuple[np.ndarray, np.ndarray]], str | None]
+) -> bytes | None:
+    """
+    Render one frame. The job holds the visible history steps followed by the current step,
+    and the path of the PNG file (None to return the PNG data instead).
+    """
+
+    global _scene, _canvas
+
+    steps, path = job
+
+    history = History()
+    for matrix, vector in steps[:-1]:
+        history.push(Gate(matrix), State(vector))
+
+    gate, state = Gate(steps[-1][0]), State(steps[-1][1])
+
+    if _scene is None:
+        _scene = draw_bloch_figure(gate, state, history, **APP_FIGURE_STYLE)
+        _canvas = FigureCanvasAgg(_scene["fig"])
+    else:
+        update_bloch_figure(_scene, gate, state, history)
+
+    # there is no animation, so the whole trajectory is shown
+    _scene["line"].set_data_3d(*_scene["points"].T)
+    _scene["line"].set_color(TO_COLOR)
+
+    if path is not None:
+        _canvas.print_png(path)
+        return None
+
+    # print_png draws the figure itself
+    return _png_bytes(_canvas)
+
+
+def _png_bytes(canvas: FigureCanvasAgg) -> bytes:
+    buffer = io.BytesIO()
+    canvas.print_png(buffer)
+    return buffer.getvalue()
+
+
+def render(
+    frames: list[tuple[np.ndarray, np.ndarray]],
+    out_dir: str | None = None,
+    video: str | None = None,
+    fps: float = 2,
+    workers: int | None = None,
+) -> float:
+    """
+    Render the frames in a process pool, into a directory of PNG files or into a video (with ffmpeg).
+
+    Returns:
+        float: The throughput in frames per second.
+    """
+
+    assert (out_dir is None) != (
+        video is None
+    ), "Give either an output directory or a video."
+
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+
+    jobs = [
+        (
+            frames[max(i - VISIBLE_HISTORY_LENGTH, 0) : i + 1],
+            None if out_dir is None else os.path.join(out_dir, f"frame_{i:05d}.png"),
+        )
+        for i in range(len(frames))
+    ]
+
+    encoder = None
+    if video is not None:
+        encoder = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "image2pipe",
+                "-framerate",
+                str(fps),
+                "-i",
+                "-",
+                "-pix_fmt",
+                "yuv420p",
+                video,
+            ],
+            stdin=subprocess.PIPE,
+        )
+
+    start = time.perf_counter()
+    workers = workers or os.cpu_count()
+    # big enough chunks keep the per-task overhead low, while every worker still gets work
+    chunksize = max(1, len(jobs) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # the results come back in order, so they can be streamed into the encoder
+        for png in pool.map(_render_frame, jobs, chunksize=chunksize):
+            if encoder is not None:
+                encoder.stdin.write(png)
+
+    if encoder is not None:
+        encoder.stdin.close()
+        encoder.wait()
+
+    return len(jobs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render the Bloch sphere for every step of a gate sequence."
+    )
+    parser.add_argument("sequence", help="the file with the state and gate commands")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--out", help="the directory of the PNG frames")
+    output.add_argument(
+        "--video", help="the video file to encode the frames into with ffmpeg"
+    )
+    parser.add_argument(
+        "--fps", type=float, default=2, help="the frame rate of the video"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="the number of processes (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    with open(args.sequence, encoding="utf-8") as file:
+        frames = parse_sequence(file)
+
+    throughput = render(
+        frames, out_dir=args.out, video=args.video, fps=args.fps, workers=args.workers
+    )
+
+    print(f"Rendered {len(frames)} frames ({throughput:.1f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
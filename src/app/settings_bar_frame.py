@@ -1,9 +1,9 @@
 from tkinter import *
 from customtkinter import *
-from application_state import gate, state, update_gate, update_state, reset_last_app_state, history, previous_inputs
+from application_state import gate, state, update_gate, update_state, reset_last_app_state, redo_app_state, jump_to_app_state, history
 import numpy as np
 from math import *
-import re
+from expression_parser import evaluate_expression, ExpressionError
 
 import sys
 import os.path
@@ -19,11 +19,10 @@ from bloch_simulator.state import State
 PRIMARY_BTN_BG_COLOR = "#007090"
 SECONDARY_BTN_BG_COLOR = "#0050c0"
 
-def _sanitize_complex_number_str(val: str) -> str:
-    val = val.replace("i", "j")
-    val = re.sub(r"(?<!\d)j", "1j", val)
-    val = val.replace(" ", "")
-    return val
+# live preview: how long to wait after the last key press before validating (ms)
+LIVE_PREVIEW_DELAY = 150
+# renders requested within this time are merged into one (ms)
+RENDER_INTERVAL = 1000 // 60
 
 def _sanitize_complex_output(val: complex) -> str:
     real = val.real
@@ -67,23 +66,19 @@ def _sanitize_complex_output(val: complex) -> str:
     
 def _convert_to_complex(val: str) -> complex:
     try:
-        val = " " + val + " "
-        sanitized_val = _sanitize_complex_number_str(val)
-        evaluated_result = eval(sanitized_val, {}, {"sqrt": np.sqrt, "sin": np.sin, "cos": np.cos, "tan": np.tan, "np": np})
-        if isinstance(evaluated_result, complex):
-            return evaluated_result
-        elif isinstance(evaluated_result, (int, float)):
-            return complex(evaluated_result)
-        elif isinstance(evaluated_result, np.ndarray):
-            return complex(evaluated_result[0])
-        elif isinstance(evaluated_result, (list, tuple)):
-            return complex(evaluated_result[0])
-        else:
-            return None
-    except Exception as e:
+        return evaluate_expression(val)
+    except ExpressionError as e:
         print(e)
         return None
 
+def _show_expression_error(entry):
+    # put the cursor on the character where parsing failed, so it is visible what to fix
+    try:
+        evaluate_expression(entry.get())
+    except ExpressionError as e:
+        entry.icursor(e.position)
+        entry.select_range(e.position, e.position + 1)
+
 def render_settings_bar_frame(root, rerender_bloch_frame):
     settings_bar = CTkFrame(master=root)
     settings_bar.pack(side=RIGHT, fill="both", expand=True)
@@ -109,8 +104,8 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
             "<Return>",
             lambda _: save_and_rerender(),
         )
+        entry.bind("<KeyRelease>", lambda _: schedule_live_preview())
         # entry.bind("<FocusOut>", lambda _: save_and_rerender)
-        entry.insert(0, _sanitize_complex_output(gate.U[i % 2, i // 2]))
         entry.grid(row=i // 2 + 1, column=i % 2, padx=5, pady=5, sticky="news")
 
     predefined_matrices = [
@@ -124,15 +119,38 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
         Gate("T^†").U,
     ]
 
-    def set_matrix(matrix):
-        # gate.set_matrix(matrix)
-        update_gate(matrix)
-        
+    # the last parsed (text, value) of every entry, so that only the edited entries are parsed again
+    matrix_cells = [None] * 4
+    state_cells = [None] * 2
+
+    def show_gate():
+        nonlocal matrix_dirty
+
+        matrix_dirty = False
+
         for i, entry in enumerate(matrix_entries):
             entry.delete(0, END)
-            entry.insert(0, _sanitize_complex_output(matrix[i % 2, i // 2]))
+            entry.insert(0, _sanitize_complex_output(gate.U[i % 2, i // 2]))
+            entry.configure(require_redraw=True, text_color="white")
+            # the text is rounded, the cell keeps the exact value
+            matrix_cells[i] = (entry.get(), gate.U[i % 2, i // 2])
+
+    def show_state():
+        nonlocal state_dirty
 
-        save_and_rerender()
+        state_dirty = False
+
+        for i, entry in enumerate(state_entries):
+            entry.delete(0, END)
+            entry.insert(0, _sanitize_complex_output(state[i]))
+            entry.configure(require_redraw=True, text_color="white")
+            state_cells[i] = (entry.get(), state[i])
+
+    def set_matrix(matrix):
+        # gate.set_matrix(matrix)
+        update_gate(matrix)
+        show_gate()
+        request_render()
 
     predefined_matrix_btns = [
         CTkButton(
@@ -150,43 +168,48 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
     def apply_gate():
         # state.set_state(gate * state)
         update_state(gate(state), update_history=True)
-
-        for i, entry in enumerate(state_entries):
-            entry.delete(0, END)
-            entry.insert(0, _sanitize_complex_output(state[i]))
-            entry.grid(row=i // 2 + 1, column=i % 2, padx=5, pady=5, sticky="news")
-
+        show_state()
+        update_history_slider()
+        rerender_bloch_frame()
+        
+    def refresh_after_history_change():
+        show_gate()
+        show_state()
+        update_history_slider()
         rerender_bloch_frame()
         
     def undo():
-        global history
         if len(history) == 0:
             return
 
         reset_last_app_state()
+        refresh_after_history_change()
         
-        for i, entry in enumerate(matrix_entries):
-            entry.delete(0, END)
-            entry.insert(0, _sanitize_complex_output(gate.U[i % 2, i // 2]))
-            entry.grid(row=i // 2 + 1, column=i % 2, padx=5, pady=5, sticky="news")
-        
-        for i, entry in enumerate(state_entries):
-            entry.delete(0, END)
-            entry.insert(0, _sanitize_complex_output(state[i]))
-            entry.grid(row=i // 2 + 1, column=i % 2, padx=5, pady=5, sticky="news")
+    def redo():
+        if not history.can_redo:
+            return
+
+        redo_app_state()
+        refresh_after_history_change()
         
-        rerender_bloch_frame()
+    def jump_to(value):
+        step = int(round(value))
+        if step == history.cursor:
+            return
+
+        jump_to_app_state(step)
+        refresh_after_history_change()
         
     matrix_btn_panel = CTkFrame(master=settings_bar)
     matrix_btn_panel.pack(side=TOP, fill="x")
-    matrix_btn_panel.grid_rowconfigure(0, weight=1)
-    matrix_btn_panel.grid_columnconfigure(tuple(range(2)), weight=1)
+    matrix_btn_panel.grid_rowconfigure(tuple(range(2)), weight=1)
+    matrix_btn_panel.grid_columnconfigure(tuple(range(3)), weight=1)
 
     button_apply = CTkButton(
         master=matrix_btn_panel,
         text="APPLY GATE",
         command=apply_gate,
-        width=190,
+        width=125,
         height=50,
         fg_color=PRIMARY_BTN_BG_COLOR,
     )
@@ -196,11 +219,41 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
         master=matrix_btn_panel,
         text="UNDO",
         command=undo,
-        width=190,
+        width=125,
         height=50,
         fg_color=PRIMARY_BTN_BG_COLOR
     )
     button_undo.grid(row=0, column=1, padx=5, pady=5, sticky="news")
+    
+    button_redo = CTkButton(
+        master=matrix_btn_panel,
+        text="REDO",
+        command=redo,
+        width=125,
+        height=50,
+        fg_color=PRIMARY_BTN_BG_COLOR
+    )
+    button_redo.grid(row=0, column=2, padx=5, pady=5, sticky="news")
+    
+    # scrubbing only moves the cursor of the history, no objects are built per step
+    history_slider = CTkSlider(
+        master=matrix_btn_panel,
+        from_=0,
+        to=1,
+        command=jump_to,
+        state="disabled",
+    )
+    history_slider.grid(row=1, column=0, columnspan=3, padx=5, pady=5, sticky="news")
+    
+    def update_history_slider():
+        last_step = history.num_steps - 1
+        
+        if last_step == 0:
+            history_slider.configure(from_=0, to=1, number_of_steps=1, state="disabled")
+        else:
+            history_slider.configure(from_=0, to=last_step, number_of_steps=last_step, state="normal")
+        
+        history_slider.set(history.cursor)
 
     state_form = CTkFrame(master=settings_bar)
     state_form.pack(side=TOP, fill="both", expand=True)
@@ -218,80 +271,149 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
         for _ in range(2)
     ]
 
-    def save_and_rerender():
+    def read_cells(entries, cells) -> bool:
+        """Parse the entries whose text changed since the last time, and return whether any of them did."""
 
-        if previous_inputs["unitary_matrix"] == list(map(lambda entry: entry.get(), matrix_entries)) and previous_inputs["state"] == list(map(lambda entry: entry.get(), state_entries)):
-            for entry in matrix_entries:
-                entry.configure(require_redraw=True, text_color="white")
-            return
-        
-        matrix_entry_values = list(map(lambda entry: entry.get(), matrix_entries))
-        matrix_entry_filled_values = list(
-            map(
-                lambda val: (
-                    _convert_to_complex(val[0]) if val[0] is not None and val[0] != "" else val[1]
-                ),
-                zip(matrix_entry_values, gate.U.flatten()),
-            )
-        )
+        changed = False
 
-        new_matrix = np.array(matrix_entry_filled_values).reshape(2, 2)
+        for i, entry in enumerate(entries):
+            text = entry.get()
+
+            if cells[i] is not None and cells[i][0] == text:
+                continue
+
+            # an empty entry keeps the current value
+            cells[i] = (text, _convert_to_complex(text) if text != "" else None)
+            changed = True
+
+        return changed
+
+    def cell_values(cells, current_values) -> list:
+        return [
+            current if cell is None or cell[0] == "" else cell[1]
+            for cell, current in zip(cells, current_values)
+        ]
+
+    # a group stays dirty until its entries are valid, so that it is checked again on the next Enter
+    matrix_dirty = False
+    state_dirty = False
+
+    def mark_invalid(entries, live: bool):
+        for entry in entries:
+            entry.configure(require_redraw=True, text_color="red")
+            if not live:
+                _show_expression_error(entry)
+
+    def save_and_rerender(live: bool = False):
+        """
+        Validate the entries and apply the gate and the state. Only the entries that changed are parsed,
+        and only the checks of the changed group (matrix or state) are run.
+        With live set (while typing), the cursor is not moved and the state entries are not rewritten.
+        """
+
+        nonlocal matrix_dirty, state_dirty
+
+        matrix_dirty = read_cells(matrix_entries, matrix_cells) or matrix_dirty
+        state_dirty = read_cells(state_entries, state_cells) or state_dirty
+        needs_render = False
+
+        if matrix_dirty:
+            # entry i shows the element U[i % 2, i // 2]
+            matrix_values = cell_values(matrix_cells, gate.U.T.flatten())
+
+            if None in matrix_values:
+                mark_invalid(matrix_entries, live)
+                return
+
+            new_matrix = np.array(matrix_values).reshape(2, 2).T
+
+            # check if the matrix is unitary
+            if not np.allclose(np.eye(2), new_matrix @ new_matrix.conj().T, rtol=1e-4):
+                mark_invalid(matrix_entries, live)
+                return
 
-        # check if the matrix is unitary
-        if None in matrix_entry_filled_values or not np.allclose(np.eye(2), new_matrix @ new_matrix.conj().T, rtol=1e-4):
-            for i, entry in enumerate(matrix_entries):
-                entry.configure(require_redraw=True, text_color="red")
-            return
-        else:
             for entry in matrix_entries:
                 entry.configure(require_redraw=True, text_color="white")
 
-        # gate.set_matrix(new_matrix)
-        update_gate(new_matrix)
-
-        state_entry_values = list(map(lambda entry: entry.get(), state_entries))
-        state_entry_filled_values = list(
-            map(
-                lambda val: (
-                    _convert_to_complex(val[0]) if val[0] is not None and val[0] != "" else val[1]
-                ),
-                zip(state_entry_values, state.state),
-            )
-        )
-        
-        if None in state_entry_filled_values:
-            for i, entry in enumerate(state_entries):
-                entry.configure(require_redraw=True, text_color="red")               
+            matrix_dirty = False
+
+            if not np.array_equal(new_matrix, gate.U):
+                # gate.set_matrix(new_matrix)
+                update_gate(new_matrix)
+                needs_render = True
+
+        if state_dirty:
+            state_values = cell_values(state_cells, state.state)
+
+            if None in state_values or np.linalg.norm(state_values) == 0:
+                mark_invalid(state_entries, live)
+                return
+
+            new_state = np.array(state_values)
+
+            # check if the state is normalized
+            normalized = not np.allclose(1, np.linalg.norm(new_state), rtol=1e-4)
+
+            if normalized:
+                new_state /= np.linalg.norm(new_state)
+
+                for i, entry in enumerate(state_entries):
+                    if not live:
+                        entry.delete(0, END)
+                        entry.insert(0, _sanitize_complex_output(new_state[i]))
+                        state_cells[i] = (entry.get(), new_state[i])
+                    entry.configure(require_redraw=True, text_color="lightblue")
+            else:
+                for entry in state_entries:
+                    entry.configure(require_redraw=True, text_color="white")
+
+            # while typing the normalized values are not written back, Enter does it later
+            state_dirty = live and normalized
+
+            if not np.array_equal(new_state, state.state):
+                # state.set_state(new_state)
+                update_state(new_state)
+                needs_render = True
+
+        if needs_render:
+            request_render()
+
+    pending_live_preview = None
+
+    def schedule_live_preview():
+        # validate once the user stops typing, instead of on every key press
+        nonlocal pending_live_preview
+
+        if not live_preview_switch.get():
             return
-        else:
-            for entry in state_entries:
-                entry.configure(require_redraw=True, text_color="white")       
 
-        new_state = np.array(state_entry_filled_values)
-        
-        # check if the state is normalized
-        if not np.allclose(1, np.linalg.norm(new_state), rtol=1e-4):
-            new_state /= np.linalg.norm(new_state)
-
-            for i, entry in enumerate(state_entries):
-                entry.delete(0, END)
-                entry.insert(0, _sanitize_complex_output(new_state[i]))
-                entry.configure(require_redraw=True, text_color="lightblue")
-        else:
-            for entry in state_entries:
-                entry.configure(require_redraw=True, text_color="white")          
+        if pending_live_preview is not None:
+            root.after_cancel(pending_live_preview)
 
-        # state.set_state(new_state)
-        update_state(new_state)
+        pending_live_preview = root.after(LIVE_PREVIEW_DELAY, run_live_preview)
 
-        previous_inputs["unitary_matrix"] = list(map(lambda entry: entry.get(), matrix_entries))
-        previous_inputs["state"] = list(map(lambda entry: entry.get(), state_entries))
+    def run_live_preview():
+        nonlocal pending_live_preview
 
-        for entry in matrix_entries:
-            entry.configure(require_redraw=True, text_color="white")
-        # for entry in state_entries:
-        #     entry.configure(require_redraw=True, text_color="white")
+        pending_live_preview = None
+        save_and_rerender(live=True)
 
+    render_pending = False
+
+    def request_render():
+        # bursts of changes are merged into at most one render per frame
+        nonlocal render_pending
+
+        if render_pending:
+            return
+
+        render_pending = True
+        root.after(RENDER_INTERVAL, render)
+
+    def render():
+        nonlocal render_pending
+
+        render_pending = False
         rerender_bloch_frame()
 
     for i, entry in enumerate(state_entries):
@@ -299,29 +421,25 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
             "<Return>",
             lambda _: save_and_rerender(),
         )
+        entry.bind("<KeyRelease>", lambda _: schedule_live_preview())
         # entry.bind(
         #     "<FocusOut>",
         #     lambda _: save_and_rerender(),
         # )
-        entry.insert(0, _sanitize_complex_output(state[i]))
         entry.grid(row=i // 2 + 1, column=i % 2, padx=5, pady=5, sticky="news")
 
     predefined_states = [
-        State(np.array([1, 0])),
-        State(np.array([0, 1])),
-        State(np.array([1 / np.sqrt(2), 1 / np.sqrt(2)])),
-        State(np.array([1 / np.sqrt(2), -1 / np.sqrt(2)])),
+        State("|0>"),
+        State("|1>"),
+        State("|+>"),
+        State("|->"),
     ]
 
-    def set_state(state):
+    def set_state(new_state):
         # state.set_state(state.state)
-        update_state(State(state.state))
-
-        for i, entry in enumerate(state_entries):
-            entry.delete(0, END)
-            entry.insert(0, _sanitize_complex_output(state[i]))
-
-        save_and_rerender()
+        update_state(State(new_state.state))
+        show_state()
+        request_render()
 
     predefined_state_btns = [
         CTkButton(
@@ -345,3 +463,9 @@ def render_settings_bar_frame(root, rerender_bloch_frame):
         fg_color=PRIMARY_BTN_BG_COLOR
     )
     button_rerender.pack(side=BOTTOM, pady=5)
+
+    live_preview_switch = CTkSwitch(master=settings_bar, text="Live preview")
+    live_preview_switch.pack(side=BOTTOM, pady=5)
+
+    show_gate()
+    show_state()
@@ -0,0 +1,190 @@
+from typing import Iterable, Self
+import numpy as np
+from bloch_simulator.density_matrix import DensityMatrix
+from bloch_simulator.gate import Gate, PAULI_MATRICES
+
+
+class Channel:
+    """
+    A class to represent a quantum channel (noise). It is represented by its Kraus operators K_k,
+    and maps a density matrix ρ to Σ K_k ρ K_k†.
+    """
+
+    def __init__(self, kraus_operators: np.ndarray | Iterable[np.ndarray]):
+        """
+        Create a new channel.
+
+        Args:
+            kraus_operators (np.ndarray | Iterable[np.ndarray]): The Kraus operators, as a Kx2x2 array or a list of 2x2 arrays.
+
+        Raises:
+            AssertionError: If the Kraus operators are not 2x2 or they are not trace preserving.
+        """
+
+        kraus_operators = np.array(kraus_operators, dtype=complex)
+
+        assert (
+            kraus_operators.ndim == 3 and kraus_operators.shape[1:] == (2, 2)
+        ), "The Kraus operators must be 2x2 matrices."
+        assert np.allclose(
+            np.einsum("kba,kbc->ac", np.conj(kraus_operators), kraus_operators),
+            np.eye(2),
+        ), "The Kraus operators must satisfy Σ K† K = I."
+
+        self._kraus_operators = kraus_operators
+
+    @property
+    def kraus_operators(self) -> np.ndarray:
+        """
+        Return the Kraus operators of the channel.
+
+        Returns:
+            np.ndarray: The Kx2x2 array of Kraus operators.
+        """
+        return self._kraus_operators
+
+    def apply(self, rho: DensityMatrix) -> DensityMatrix:
+        """Apply the channel to a density matrix (or to a batch of them) with a single einsum.
+
+        Args:
+            rho (DensityMatrix): The density matrix to apply the channel to.
+
+        Returns:
+            DensityMatrix: The new density matrix after applying the channel.
+        """
+
+        kraus = self._kraus_operators
+
+        return DensityMatrix(
+            np.einsum("kab,...bc,kdc->...ad", kraus, rho.rho, np.conj(kraus))
+        )
+
+    def __matmul__(self, rho: DensityMatrix) -> DensityMatrix:
+        """Apply the channel to a density matrix using the @ operator.
+
+        Args:
+            rho (DensityMatrix): The density matrix to apply the channel to.
+
+        Returns:
+            DensityMatrix: The new density matrix after applying the channel.
+        """
+
+        assert isinstance(
+            rho, DensityMatrix
+        ), "The state must be a DensityMatrix object."
+
+        return self.apply(rho)
+
+    def __call__(self, *args: DensityMatrix) -> DensityMatrix:
+        """Apply the channel to a density matrix using the () operator.
+
+        Returns:
+            DensityMatrix: The new density matrix after applying the channel.
+        """
+
+        assert len(args) == 1, "The channel must be applied to a single state."
+        assert isinstance(
+            args[0], DensityMatrix
+        ), "The state must be a DensityMatrix object."
+
+        return self.apply(args[0])
+
+    def __repr__(self) -> str:
+        return f"Channel({len(self._kraus_operators)} Kraus operators)"
+
+    @staticmethod
+    def from_gate(gate: Gate) -> Self:
+        """Create the (noiseless) channel of a unitary gate.
+
+        Args:
+            gate (Gate): The gate.
+
+        Returns:
+            Channel: The channel with the single Kraus operator U.
+        """
+        return Channel([gate.U])
+
+    @staticmethod
+    def amplitude_damping(gamma: float) -> Self:
+        """Create an amplitude damping channel, which relaxes the state towards |0> (energy loss, T1).
+
+        Args:
+            gamma (float): The probability of decaying from |1> to |0>.
+
+        Returns:
+            Channel: The amplitude damping channel.
+        """
+
+        assert 0 <= gamma <= 1, "The probability must be between 0 and 1."
+
+        return Channel(
+            [
+                [[1, 0], [0, np.sqrt(1 - gamma)]],
+                [[0, np.sqrt(gamma)], [0, 0]],
+            ]
+        )
+
+    @staticmethod
+    def phase_damping(gamma: float) -> Self:
+        """Create a phase damping channel, which shrinks the Bloch vector towards the Z axis (dephasing, T2).
+
+        Args:
+            gamma (float): The damping probability.
+
+        Returns:
+            Channel: The phase damping channel.
+        """
+
+        assert 0 <= gamma <= 1, "The probability must be between 0 and 1."
+
+        return Channel(
+            [
+                [[1, 0], [0, np.sqrt(1 - gamma)]],
+                [[0, 0], [0, np.sqrt(gamma)]],
+            ]
+        )
+
+    @staticmethod
+    def pauli(p_x: float, p_y: float, p_z: float) -> Self:
+        """Create a Pauli channel, which applies X, Y or Z with the given probabilities.
+
+        Args:
+            p_x (float): The probability of an X error.
+            p_y (float): The probability of a Y error.
+            p_z (float): The probability of a Z error.
+
+        Returns:
+            Channel: The Pauli channel.
+        """
+
+        probabilities = np.array([p_x, p_y, p_z], dtype=float)
+        total = probabilities.sum()
+
+        assert np.all(probabilities >= 0) and (
+            total <= 1 or np.isclose(total, 1)
+        ), "The probabilities must be non-negative and sum to at most 1."
+
+        return Channel(
+            np.concatenate(
+                [
+                    # a sum of 1 up to rounding must not give the square root of a negative number
+                    np.sqrt(max(1 - total, 0.0)) * np.eye(2)[None],
+                    np.sqrt(probabilities)[:, None, None] * PAULI_MATRICES,
+                ]
+            )
+        )
+
+    @staticmethod
+    def depolarizing(p: float) -> Self:
+        """Create a depolarizing channel, which maps ρ to (1 - p) ρ + p I / 2.
+
+        Args:
+            p (float): The depolarizing probability.
+
+        Returns:
+            Channel: The depolarizing channel.
+        """
+
+        assert 0 <= p <= 1, "The probability must be between 0 and 1."
+
+        return Channel.pauli(p / 4, p / 4, p / 4)
@@ -0,0 +1,161 @@
+from typing import Iterable
+import numpy as np
+from bloch_simulator.gate import Gate
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+
+class Circuit:
+    """
+    A class to represent an ordered sequence of gates. The first gate of the sequence is applied first.
+
+    The sequence can be fused into a single gate, which is cached until the circuit is modified.
+    The circuit keeps copies of the gates, so changing a gate afterwards (e.g. with set_matrix) does not affect it,
+    and fused returns a copy of the cached gate.
+    """
+
+    def __init__(self, gates: Iterable[Gate] | None = None):
+        """
+        Create a new circuit.
+
+        Args:
+            gates (Iterable[Gate] | None): The gates of the circuit, in the order they are applied. Defaults to an empty circuit.
+
+        Raises:
+            AssertionError: If an element is not a Gate.
+        """
+
+        self._gates = []
+        self._fused = None
+
+        if gates is not None:
+            self.extend(gates)
+
+    @property
+    def gates(self) -> list[Gate]:
+        """
+        Return the gates of the circuit.
+
+        Returns:
+            list[Gate]: Copies of the gates, in the order they are applied.
+        """
+        return [Gate(gate) for gate in self._gates]
+
+    def append(self, gate: Gate):
+        """
+        Append a gate to the end of the circuit.
+
+        Args:
+            gate (Gate): The gate to append.
+        """
+
+        assert isinstance(gate, Gate), "The gate must be a Gate object."
+
+        self._gates.append(Gate(gate))
+        self._fused = None
+
+    def extend(self, gates: Iterable[Gate]):
+        """
+        Append several gates to the end of the circuit.
+
+        Args:
+            gates (Iterable[Gate]): The gates to append, in the order they are applied.
+        """
+
+        gates = list(gates)
+
+        assert all(
+            isinstance(gate, Gate) for gate in gates
+        ), "All elements must be Gate objects."
+
+        self._gates.extend(Gate(gate) for gate in gates)
+        self._fused = None
+
+    @property
+    def fused(self) -> Gate:
+        """
+        Return the single gate that is equivalent to the whole circuit.
+
+        The product is computed with a tree reduction: in each round, neighbouring pairs are multiplied
+        in a single batched np.matmul call, so a circuit of K gates takes log2(K) numpy calls.
+
+        Returns:
+            Gate: A copy of the fused gate.
+        """
+
+        return Gate(self._fuse())
+
+    def _fuse(self) -> Gate:
+        if self._fused is not None:
+            return self._fused
+
+        if len(self._gates) == 0:
+            self._fused = Gate("I")
+            return self._fused
+
+        # the last gate is the leftmost factor of the product
+        matrices = np.array([gate.U for gate in reversed(self._gates)], dtype=complex)
+
+        while matrices.shape[0] > 1:
+            if matrices.shape[0] % 2 == 1:
+                # pad with the identity, so that every matrix has a pair
+                matrices = np.concatenate([matrices, np.eye(2, dtype=complex)[None]])
+
+            matrices = np.matmul(matrices[0::2], matrices[1::2])
+
+        # the cached matrix is read-only, so the copies returned by fused share it and cannot change it
+        fused_matrix = matrices[0]
+        fused_matrix.flags.writeable = False
+        self._fused = Gate(fused_matrix)
+
+        return self._fused
+
+    def apply(self, state: State | StateBatch) -> State | StateBatch:
+        """Apply the circuit to a state (or a batch of states) with a single matrix product.
+
+        Args:
+            state (State | StateBatch): The state (or batch of states) to apply the circuit to.
+
+        Returns:
+            State | StateBatch: The new state (or batch of states) after applying the circuit.
+        """
+        return self._fuse().apply(state)
+
+    def __matmul__(self, state: State | StateBatch) -> State | StateBatch:
+        """Apply the circuit to a state using the @ operator.
+
+        Args:
+            state (State | StateBatch): The state (or batch of states) to apply the circuit to.
+
+        Returns:
+            State | StateBatch: The new state (or batch of states) after applying the circuit.
+        """
+
+        assert isinstance(
+            state, (State, StateBatch)
+        ), "The state must be a State or StateBatch object."
+
+        return self.apply(state)
+
+    def __call__(self, *args: State | StateBatch) -> State | StateBatch:
+        """Apply the circuit to a state using the () operator.
+
+        Returns:
+            State | StateBatch: The new state (or batch of states) after applying the circuit.
+        """
+
+        assert len(args) == 1, "The circuit must be applied to a single state."
+        assert isinstance(
+            args[0], (State, StateBatch)
+        ), "The state must be a State or StateBatch object."
+
+        return self.apply(args[0])
+
+    def __len__(self) -> int:
+        return len(self._gates)
+
+    def __iter__(self):
+        return iter(self.gates)
+
+    def __repr__(self) -> str:
+        return f"Circuit({self._gates})"
@@ -0,0 +1,651 @@
+"""
+Decomposition of single-qubit gates: ZYZ Euler angles, and approximation with Clifford+T sequences.
+
+Both work up to the global phase. Every matrix V in SU(2) is written as a unit quaternion q = (a, b, c, d) with
+V = a I - i (b X + c Y + d Z). V and -V are the same rotation, so q and -q are identified, and the distance of two
+gates is the operator norm distance min_φ ||U - e^(iφ) V|| = sqrt(2 - 2 |<q_U, q_V>|), which is the Euclidean
+distance of the quaternions with matching signs.
+"""
+
+import os
+import os.path
+from functools import cache
+import numpy as np
+from bloch_simulator.circuit import Circuit
+from bloch_simulator.gate import Gate, NAMED_GATES, quaternion_product
+from bloch_simulator.gate_batch import GateBatch
+
+
+def _as_matrices(gates: Gate | GateBatch | np.ndarray) -> np.ndarray:
+    if isinstance(gates, Gate):
+        return np.asarray(gates.U, dtype=complex)
+
+    if isinstance(gates, GateBatch):
+        return np.asarray(gates.matrices, dtype=complex)
+
+    gates = np.asarray(gates, dtype=complex)
+    assert gates.shape[-2:] == (2, 2), "The matrices must be of shape ...x2x2."
+
+    return gates
+
+
+def _special_unitary(matrices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Split ...x2x2 unitaries into the global phase and the matrix in SU(2)."""
+
+    determinants = (
+        matrices[..., 0, 0] * matrices[..., 1, 1]
+        - matrices[..., 0, 1] * matrices[..., 1, 0]
+    )
+    phases = np.angle(determinants) / 2
+
+    return phases, matrices * np.exp(-1j * phases)[..., None, None]
+
+
+def quaternions(gates: Gate | GateBatch | np.ndarray) -> np.ndarray:
+    """Return the unit quaternions of gates, with the sign chosen so that the largest component is positive.
+
+    Args:
+        gates (Gate | GateBatch | np.ndarray): A gate, a batch or an array of shape ...x2x2.
+
+    Returns:
+        np.ndarray: The quaternions (a, b, c, d), of shape ...x4.
+    """
+
+    _, special = _special_unitary(_as_matrices(gates))
+
+    q = np.stack(
+        [
+            special[..., 0, 0].real,
+            -special[..., 1, 0].imag,
+            special[..., 1, 0].real,
+            -special[..., 0, 0].imag,
+        ],
+        axis=-1,
+    )
+
+    largest = np.take_along_axis(q, np.abs(q).argmax(axis=-1)[..., None], axis=-1)
+
+    return q * np.where(largest < 0, -1.0, 1.0)
+
+
+def distance(
+    a: Gate | GateBatch | np.ndarray, b: Gate | GateBatch | np.ndarray
+) -> np.ndarray:
+    """Return the distance of gates up to global phase, min_φ ||A - e^(iφ) B|| in operator norm (broadcast).
+
+    Returns:
+        np.ndarray: The distances, in [0, sqrt(2)].
+    """
+
+    overlaps = np.abs(np.sum(quaternions(a) * quaternions(b), axis=-1))
+
+    return np.sqrt(np.maximum(2 - 2 * overlaps, 0))
+
+
+def zyz_angles(
+    gates: Gate | GateBatch | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Decompose gates as U = e^(i phase) Rz(alpha) Ry(beta) Rz(gamma), in closed form for a whole stack at once.
+
+    Rz(t) = exp(-i t Z / 2) and Ry(t) = exp(-i t Y / 2), so Rz(gamma) is applied first.
+
+    Args:
+        gates (Gate | GateBatch | np.ndarray): A gate, a batch or an array of shape ...x2x2.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The phase, alpha, beta (in [0, π]) and gamma, each of shape ...
+    """
+
+    phases, special = _special_unitary(_as_matrices(gates))
+
+    # V = [[e^(-i(α+γ)/2) cos(β/2), -e^(-i(α-γ)/2) sin(β/2)], [e^(i(α-γ)/2) sin(β/2), e^(i(α+γ)/2) cos(β/2)]]
+    # one of the two angles is free when cos(β/2) or sin(β/2) is 0, np.angle(0) = 0 picks one
+    half_sum = np.angle(special[..., 1, 1])
+    half_difference = np.angle(special[..., 1, 0])
+    beta = 2 * np.arctan2(np.abs(special[..., 1, 0]), np.abs(special[..., 1, 1]))
+
+    return phases, half_sum + half_difference, beta, half_sum - half_difference
+
+
+def zyz_matrices(
+    phases: np.ndarray, alpha: np.ndarray, beta: np.ndarray, gamma: np.ndarray
+) -> np.ndarray:
+    """Build the matrices e^(i phase) Rz(alpha) Ry(beta) Rz(gamma), the inverse of zyz_angles (broadcast).
+
+    Returns:
+        np.ndarray: The matrices, of shape ...x2x2.
+    """
+
+    phases, alpha, beta, gamma = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (phases, alpha, beta, gamma))
+    )
+
+    cos_half, sin_half = np.cos(beta / 2), np.sin(beta / 2)
+    half_sum, half_difference = (alpha + gamma) / 2, (alpha - gamma) / 2
+
+    matrices = np.empty(phases.shape + (2, 2), dtype=complex)
+    matrices[..., 0, 0] = np.exp(-1j * half_sum) * cos_half
+    matrices[..., 0, 1] = -np.exp(-1j * half_difference) * sin_half
+    matrices[..., 1, 0] = np.exp(1j * half_difference) * sin_half
+    matrices[..., 1, 1] = np.exp(1j * half_sum) * cos_half
+
+    return np.exp(1j * phases)[..., None, None] * matrices
+
+
+# the words of the table are built from these, every Clifford+T gate (up to phase) is a product of them
+CLIFFORD_T_GENERATORS = ["H", "S", "T"]
+DEFAULT_TABLE_SIZE = 1 << 14
+_TABLE_FORMAT_VERSION = 1
+# the inputs are rounded to a grid of this fraction of epsilon before they are looked up in the memo
+_QUANTIZATION = 1 / 32
+_MAX_MEMO_SIZE = 1 << 16
+# the grids of the table for the last few cell sizes are kept (every tolerance needs its own)
+_MAX_GRIDS = 4
+
+
+def _default_table_path(size: int) -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+
+    return os.path.join(
+        cache_dir,
+        "bloch_simulator",
+        f"clifford_t_v{_TABLE_FORMAT_VERSION}_{size}.npz",
+    )
+
+
+class CliffordTTable:
+    """
+    An ε-net of Clifford+T gates: the shortest words of the generators, one for every distinct gate (up to phase).
+
+    A gate is approximated either by the nearest entry of the table, or by the best product of two entries
+    (meet in the middle), which covers about the square of the size of the table.
+    Stacks of gates are searched together, and the results are memoized per cell of a grid over the inputs.
+    """
+
+    def __init__(self, words: list[str], table_quaternions: np.ndarray):
+        """
+        Create a table from its words and their quaternions (see quaternions).
+
+        Args:
+            words (list[str]): The words, as the names of the gates joined by "·", in matrix product order
+                (like in Gate.__repr__: "H·T" applies T first). The identity is the empty word.
+            table_quaternions (np.ndarray): The quaternions of the words, of shape Nx4.
+        """
+
+        assert len(words) == len(table_quaternions), "Every word needs a quaternion."
+
+        self._words = list(words)
+        self._quaternions = np.asarray(table_quaternions, dtype=float)
+
+        gate_lists = [word.split("·") if word != "" else [] for word in self._words]
+        # T-count first, then the number of gates, scaled so that the sum of two costs compares the same way
+        self._costs = np.array(
+            [
+                sum(name.startswith("T") for name in names) * 1024 + len(names)
+                for names in gate_lists
+            ]
+        )
+        # the quaternions of the inverses A†
+        self._conjugates = self._quaternions * np.array([1.0, -1.0, -1.0, -1.0])
+        self._memo = {}
+        self._grids = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    @property
+    def words(self) -> list[str]:
+        return list(self._words)
+
+    @property
+    def quaternions(self) -> np.ndarray:
+        """Return the Nx4 quaternions of the words, e.g. for a GateIndex."""
+        return self._quaternions
+
+    @staticmethod
+    def build(size: int = DEFAULT_TABLE_SIZE) -> "CliffordTTable":
+        """Build a table by breadth-first search over the words of the generators, keeping the first (shortest) word of every gate.
+
+        Args:
+            size (int): The number of gates in the table.
+
+        Returns:
+            CliffordTTable: The table.
+        """
+
+        generators = np.array([NAMED_GATES[name] for name in CLIFFORD_T_GENERATORS])
+
+        words = [""]
+        matrices = [np.eye(2, dtype=complex)]
+        seen = {_table_key(quaternions(matrices[0]))}
+        layer_words, layer_matrices = words, np.array(matrices)
+
+        while len(words) < size and len(layer_words) > 0:
+            # append every generator to every word of the last layer, in a single product
+            candidates = (layer_matrices[:, None] @ generators[None]).reshape(-1, 2, 2)
+            candidate_keys = map(_table_key, quaternions(candidates))
+
+            next_words, next_matrices = [], []
+
+            for i, key in enumerate(candidate_keys):
+                if key in seen:
+                    continue
+
+                seen.add(key)
+                word = layer_words[i // len(generators)]
+                generator = CLIFFORD_T_GENERATORS[i % len(generators)]
+                next_words.append(generator if word == "" else f"{word}·{generator}")
+                next_matrices.append(candidates[i])
+
+                if len(words) + len(next_words) == size:
+                    break
+
+            words += next_words
+            matrices += next_matrices
+            layer_words, layer_matrices = next_words, np.array(next_matrices)
+
+        return CliffordTTable(words, quaternions(np.array(matrices)))
+
+    def save(self, path: str):
+        """Save the table into a .npz file."""
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(
+            path, words=np.array(self._words), quaternions=self._quaternions
+        )
+
+    @staticmethod
+    def load(path: str) -> "CliffordTTable":
+        """Load a table saved with save."""
+
+        with np.load(path) as data:
+            return CliffordTTable(data["words"].tolist(), data["quaternions"])
+
+    @staticmethod
+    def load_or_build(
+        path: str | None = None, size: int = DEFAULT_TABLE_SIZE
+    ) -> "CliffordTTable":
+        """Load the table from disk, or build and save it if it does not exist yet.
+
+        Args:
+            path (str | None): The .npz file. Defaults to a file in the user's cache directory.
+            size (int): The number of gates in the table, if it has to be built.
+
+        Returns:
+            CliffordTTable: The table.
+        """
+
+        path = path or _default_table_path(size)
+
+        if os.path.isfile(path):
+            return CliffordTTable.load(path)
+
+        table = CliffordTTable.build(size)
+
+        try:
+            table.save(path)
+        except OSError:
+            # the table can be built again next time
+            pass
+
+        return table
+
+    def approximate(self, gate: Gate | np.ndarray, epsilon: float = 1e-2) -> tuple[str, float]:
+        """Approximate a gate (up to global phase) with a word of the table, or a product of two words.
+
+        A short sequence within epsilon is returned whenever the table has one. The shortest one (by T-count,
+        then length) is searched with the tighter tolerance epsilon (1 - 2 _QUANTIZATION) first, so that it can be
+        memoized for the whole cell of the input (see approximate_many), and with epsilon itself if that fails.
+        If there is none, the tolerance is doubled until a sequence is found, and the closest one is returned,
+        its error tells how far it is.
+
+        Args:
+            gate (Gate | np.ndarray): The gate to approximate.
+            epsilon (float): The allowed distance (see distance). Defaults to 1e-2.
+
+        Returns:
+            tuple[str, float]: The word in matrix product order, and its distance from the gate.
+        """
+
+        words, errors = self.approximate_many(_as_matrices(gate).reshape(1, 2, 2), epsilon)
+
+        return words[0], float(errors[0])
+
+    def approximate_many(
+        self, gates: GateBatch | np.ndarray, epsilon: float = 1e-2
+    ) -> tuple[list[str], np.ndarray]:
+        """Approximate a stack of gates like approximate, searching the table for all of them at once.
+
+        The words are memoized per cell of a grid over the inputs (of step epsilon * _QUANTIZATION), so repeated
+        and nearby gates are only searched once. A memoized word is always checked against the actual input.
+
+        Args:
+            gates (GateBatch | np.ndarray): The gates, a batch or an array of shape Kx2x2.
+            epsilon (float): The allowed distance (see distance). Defaults to 1e-2.
+
+        Returns:
+            tuple[list[str], np.ndarray]: The words in matrix product order, and their distances from the gates (shape K).
+        """
+
+        targets = quaternions(gates).reshape(-1, 4)
+
+        # two inputs in the same cell are at most 2 δ apart, so a word within epsilon - 2 δ of one of them
+        # is within epsilon of every input of the cell, only such words are memoized (None marks the cells without one)
+        step = epsilon * _QUANTIZATION
+        cells, representatives, inverse = np.unique(
+            np.rint(targets / step).astype(np.int64),
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+        )
+        inverse = inverse.reshape(-1)
+        keys = [(cell.tobytes(), epsilon) for cell in cells]
+
+        missing = [i for i, key in enumerate(keys) if key not in self._memo]
+
+        if len(missing) > 0:
+            found_words, found_quaternions, met = self._search(
+                targets[representatives[missing]], epsilon - 2 * step
+            )
+
+            for i, word, quaternion, is_met in zip(missing, found_words, found_quaternions, met):
+                self._remember(keys[i], (word, quaternion) if is_met else None)
+
+        entries = [self._memo.get(key) for key in keys]
+        cell_words = [entry[0] if entry is not None else "" for entry in entries]
+        cell_quaternions = np.array(
+            [entry[1] if entry is not None else np.full(4, np.nan) for entry in entries]
+        ).reshape(-1, 4)
+
+        words = [cell_words[i] for i in inverse]
+        word_quaternions = cell_quaternions[inverse]
+
+        # the inputs without a memoized word within epsilon are searched on their own, without memoizing
+        with np.errstate(invalid="ignore"):
+            unresolved = np.flatnonzero(
+                ~(_distances(word_quaternions, targets) <= epsilon)
+            )
+
+        if len(unresolved) > 0:
+            # identical inputs are only searched once
+            _, first, repeats = np.unique(
+                targets[unresolved], axis=0, return_index=True, return_inverse=True
+            )
+            found_words, found_quaternions, _ = self._search(targets[unresolved[first]], epsilon)
+            repeats = repeats.reshape(-1)
+            word_quaternions[unresolved] = found_quaternions[repeats]
+
+            for row, j in zip(unresolved, repeats):
+                words[row] = found_words[j]
+
+        return words, _distances(word_quaternions, targets)
+
+    def _remember(self, key: tuple[bytes, float], entry: tuple[str, np.ndarray] | None):
+        if len(self._memo) >= _MAX_MEMO_SIZE:
+            del self._memo[next(iter(self._memo))]
+
+        self._memo[key] = entry
+
+    def _search(
+        self, targets: np.ndarray, epsilon: float
+    ) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """
+        Find the shortest word or product of two words within epsilon of each target quaternion (shape Mx4).
+        For the targets without one, the tolerance is doubled until the closest product is found.
+
+        Returns:
+            tuple[list[str], np.ndarray, np.ndarray]: The words, their quaternions (shape Mx4), and whether they are within epsilon.
+        """
+
+        # the indices of the two factors of every result, -1 for the identity
+        first = np.full(len(targets), -1)
+        second = np.full(len(targets), -1)
+
+        rows, entries, _ = self._pairs_within(targets, epsilon)
+        best = _best_per_row(rows, self._costs[entries], len(targets))
+        direct = best >= 0
+        second[direct] = entries[best[direct]]
+
+        # meet in the middle: A·B ≈ V means B ≈ A†V, so the quaternions of A†V are looked up in the table
+        remaining = np.flatnonzero(~direct)
+        met = direct.copy()
+        tolerance = epsilon
+        rows_per_chunk = max(_MAX_REMAINDERS // len(self), 1)
+
+        while len(remaining) > 0:
+            closest = tolerance > epsilon
+            found = np.zeros(len(remaining), dtype=bool)
+
+            for start in range(0, len(remaining), rows_per_chunk):
+                chunk = remaining[start : start + rows_per_chunk]
+                remainders = quaternion_product(
+                    self._conjugates[None], targets[chunk][:, None]
+                ).reshape(-1, 4)
+
+                pair_rows, pair_second, overlaps = self._pairs_within(remainders, tolerance)
+                pair_first = pair_rows % len(self)
+                pair_rows //= len(self)
+
+                # the shortest pair within epsilon, or the closest one when the tolerance had to be raised
+                scores = (
+                    -overlaps
+                    if closest
+                    else self._costs[pair_first] + self._costs[pair_second]
+                )
+                best = _best_per_row(pair_rows, scores, len(chunk))
+                has_pair = best >= 0
+
+                first[chunk[has_pair]] = pair_first[best[has_pair]]
+                second[chunk[has_pair]] = pair_second[best[has_pair]]
+                found[start : start + len(chunk)] = has_pair
+
+            if not closest:
+                met[remaining] = found
+
+            remaining = remaining[~found]
+            # nothing is precise enough, look for the closest pair a bit further away
+            tolerance *= 2
+
+        identity = np.array([1.0, 0.0, 0.0, 0.0])
+        result_quaternions = quaternion_product(
+            np.where(first[:, None] >= 0, self._quaternions[first], identity),
+            np.where(second[:, None] >= 0, self._quaternions[second], identity),
+        )
+        words = [
+            "·".join(self._words[i] for i in pair if i >= 0 and self._words[i] != "")
+            for pair in zip(first.tolist(), second.tolist())
+        ]
+
+        return words, result_quaternions, met
+
+    def _pairs_within(
+        self, remainders: np.ndarray, tolerance: float, chunk_size: int = 1 << 14
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the pairs (i, j) where entry j of the table is within the tolerance of remainder i, and their overlaps.
+
+        The table (with the negatives of the quaternions, which are the same gates) is bucketed into a 4D grid
+        with cells of twice the tolerance. Along each axis, the points within the tolerance are either in the cell
+        of the remainder or in the neighboring cell on its nearer side, so only 16 cells need to be checked.
+        The cells are found with a binary search in the sorted keys of the occupied cells, most of the neighboring
+        cells are empty and a hash set of the occupied cells (a boolean array indexed by the low bits of the keys)
+        rules them out first.
+        """
+
+        cell_size = 2 * max(tolerance, _MIN_CELL_SIZE)
+        sorted_keys, order, occupied = self._grid(cell_size)
+        min_overlap = _min_overlap(tolerance)
+
+        first, second, overlaps = [], [], []
+
+        for start in range(0, len(remainders), chunk_size):
+            scaled = remainders[start : start + chunk_size] / cell_size
+            cells = np.floor(scaled)
+            sides = np.where(scaled - cells < 0.5, -1, 1)
+
+            keys = _cell_keys(
+                cells.astype(np.int64)[:, None] + _NEIGHBOR_OFFSETS * sides[:, None],
+                cell_size,
+            ).ravel()
+            rows = np.repeat(
+                np.arange(start, start + len(cells)), _NEIGHBOR_OFFSETS.shape[0]
+            )
+
+            hits = occupied[keys & (len(occupied) - 1)]
+            keys, rows = keys[hits], rows[hits]
+
+            low = np.searchsorted(sorted_keys, keys, side="left")
+            counts = np.searchsorted(sorted_keys, keys, side="right") - low
+            total = counts.sum()
+
+            if total == 0:
+                continue
+
+            # the table indices in all the matching cells, flattened
+            starts = np.repeat(np.cumsum(counts) - counts, counts)
+            # the grid holds every quaternion twice, with both signs
+            candidates = order[np.repeat(low, counts) + np.arange(total) - starts] % len(self)
+            candidate_rows = np.repeat(rows, counts)
+
+            candidate_overlaps = np.abs(
+                np.sum(remainders[candidate_rows] * self._quaternions[candidates], axis=1)
+            )
+            close = candidate_overlaps >= min_overlap
+
+            first.append(candidate_rows[close])
+            second.append(candidates[close])
+            overlaps.append(candidate_overlaps[close])
+
+        if len(first) == 0:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+
+        return np.concatenate(first), np.concatenate(second), np.concatenate(overlaps)
+
+    def _grid(self, cell_size: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the sorted cell keys of the table entries, the order that sorts them, and the hash set of the occupied
+        cells (see _pairs_within). The grids of the last _MAX_GRIDS cell sizes are cached.
+        """
+
+        if cell_size in self._grids:
+            # the most recently used grid goes last
+            self._grids[cell_size] = self._grids.pop(cell_size)
+            return self._grids[cell_size]
+
+        keys = _cell_keys(
+            np.floor(
+                np.concatenate([self._quaternions, -self._quaternions]) / cell_size
+            ).astype(np.int64),
+            cell_size,
+        )
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        # a power of two, with about 16 slots per entry so that few empty cells collide with an occupied one
+        occupied = np.zeros(1 << int(16 * len(keys)).bit_length(), dtype=bool)
+        occupied[keys & (len(occupied) - 1)] = True
+
+        if len(self._grids) >= _MAX_GRIDS:
+            del self._grids[next(iter(self._grids))]
+
+        self._grids[cell_size] = (sorted_keys, order, occupied)
+
+        return self._grids[cell_size]
+
+
+# the 2^4 offsets of the neighboring cells, multiplied by the nearer side along each axis
+_NEIGHBOR_OFFSETS = np.stack(
+    np.meshgrid(*[[0, 1]] * 4, indexing="ij"), axis=-1
+).reshape(-1, 4)
+# below this, the keys of the cells would not fit into 64 bits
+_MIN_CELL_SIZE = 1e-4
+# the most remainders of the meet in the middle search that are held at once
+_MAX_REMAINDERS = 1 << 18
+
+
+def _distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # the distances of the gates of two stacks of quaternions (shape ...x4)
+    overlaps = np.abs(np.sum(a * b, axis=-1))
+
+    return np.sqrt(np.maximum(2 - 2 * overlaps, 0))
+
+
+def _best_per_row(rows: np.ndarray, scores: np.ndarray, n_rows: int) -> np.ndarray:
+    """Return the index (into rows) of the lowest score of every row, or -1 for the rows that do not occur."""
+
+    best = np.full(n_rows, -1)
+
+    if len(rows) == 0:
+        return best
+
+    order = np.lexsort((scores, rows))
+    sorted_rows = rows[order]
+    firsts = np.concatenate([[True], sorted_rows[1:] != sorted_rows[:-1]])
+    best[sorted_rows[firsts]] = order[firsts]
+
+    return best
+
+
+def _min_overlap(epsilon: float) -> float:
+    # |<q, target>| >= this is the same as being within epsilon
+    return 1 - epsilon**2 / 2
+
+
+def _cell_keys(cells: np.ndarray, cell_size: float) -> np.ndarray:
+    """Pack the integer coordinates of 4D grid cells (shape ...x4) into single integers."""
+
+    # the quaternions are in [-1, 1], so the cells are in [-offset, offset)
+    offset = int(np.ceil(1 / cell_size)) + 2
+    base = 2 * offset + 1
+    shifted = cells + offset
+
+    return ((shifted[..., 0] * base + shifted[..., 1]) * base + shifted[..., 2]) * base + shifted[..., 3]
+
+
+def _table_key(quaternion: np.ndarray) -> bytes:
+    return np.rint(quaternion * 1e8).astype(np.int64).tobytes()
+
+
+@cache
+def default_clifford_t_table() -> CliffordTTable:
+    """Return the default table, loaded from (or built into) the user's cache directory once per process."""
+
+    return CliffordTTable.load_or_build()
+
+
+def approximate_clifford_t(
+    gates: Gate | GateBatch | np.ndarray,
+    epsilon: float = 1e-2,
+    table: CliffordTTable | None = None,
+) -> tuple[Circuit, float] | list[tuple[Circuit, float]]:
+    """Approximate gates (up to global phase) with Clifford+T circuits.
+
+    Args:
+        gates (Gate | GateBatch | np.ndarray): A gate, a batch or an array of shape 2x2 or Kx2x2.
+        epsilon (float): The allowed distance (see distance). Defaults to 1e-2.
+        table (CliffordTTable | None): The table to use. Defaults to default_clifford_t_table().
+
+    Returns:
+        tuple[Circuit, float] | list[tuple[Circuit, float]]: The circuit (made of H, S and T gates) and its distance
+            from the gate, or a list of them for a batch.
+    """
+
+    if table is None:
+        table = default_clifford_t_table()
+
+    matrices = _as_matrices(gates)
+
+    words, errors = table.approximate_many(matrices.reshape(-1, 2, 2), epsilon)
+
+    # the words are in matrix product order, a circuit applies its first gate first
+    results = [
+        (
+            Circuit(Gate(name) for name in reversed(word.split("·") if word != "" else [])),
+            float(error),
+        )
+        for word, error in zip(words, errors)
+    ]
+
+    return results[0] if matrices.ndim == 2 else results
@@ -0,0 +1,142 @@
+from typing import Self
+import numpy as np
+from bloch_simulator.measurement import sample_counts
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+
+class DensityMatrix:
+    """
+    Class to represent a (possibly mixed) quantum state. It is represented by a 2x2 density matrix,
+    or by an Nx2x2 array for a batch of N states.
+    """
+
+    def __init__(self, rho: np.ndarray | State | StateBatch | Self):
+        """
+        Create a new density matrix.
+
+        Args:
+            rho: The density matrix can be given in different ways:
+                - With a numpy array of shape 2x2 or Nx2x2.
+                - With a State, the density matrix is the pure state |ψ><ψ|.
+                - With a StateBatch, the result is a batch of pure states.
+                - With another density matrix.
+
+        Raises:
+            ValueError: If the arguments are invalid.
+        """
+        if isinstance(rho, DensityMatrix):
+            self._rho = rho.rho.copy()
+        elif isinstance(rho, State):
+            self._rho = np.outer(rho.state, np.conj(rho.state))
+        elif isinstance(rho, StateBatch):
+            self._rho = np.einsum("na,nb->nab", rho.states, np.conj(rho.states))
+        elif isinstance(rho, np.ndarray):
+            assert rho.shape[-2:] == (2, 2) and rho.ndim in (
+                2,
+                3,
+            ), "The density matrix must be of shape 2x2 or Nx2x2."
+            self._rho = rho
+        else:
+            raise ValueError("Invalid arguments.")
+
+    @property
+    def rho(self) -> np.ndarray:
+        """
+        Return the density matrix.
+
+        Returns:
+            np.ndarray: The 2x2 (or Nx2x2) density matrix.
+        """
+        return self._rho
+
+    @property
+    def is_batch(self) -> bool:
+        """
+        Return whether this object holds a batch of density matrices.
+
+        Returns:
+            bool: True if the density matrix is of shape Nx2x2.
+        """
+        return self._rho.ndim == 3
+
+    @property
+    def bloch_coordinates(self) -> np.ndarray[float]:
+        """
+        Return the Bloch vector r = (tr(ρX), tr(ρY), tr(ρZ)). For mixed states it lies inside the sphere.
+
+        Returns:
+            np.ndarray[float]: The Bloch vector (or an Nx3 array of them).
+        """
+        rho = self._rho
+        off_diagonal = rho[..., 1, 0]
+
+        return np.stack(
+            [
+                2 * np.real(off_diagonal),
+                2 * np.imag(off_diagonal),
+                np.real(rho[..., 0, 0] - rho[..., 1, 1]),
+            ],
+            axis=-1,
+        )
+
+    @property
+    def purity(self) -> float | np.ndarray[float]:
+        """
+        Return the purity tr(ρ²), which is 1 for pure states and 1/2 for the maximally mixed state.
+
+        Returns:
+            float | np.ndarray[float]: The purity (or the purities of the batch).
+        """
+        return np.real(np.einsum("...ab,...ba->...", self._rho, self._rho))
+
+    def measure(
+        self,
+        basis: str | np.ndarray = "Z",
+        shots: int = 1024,
+        rng: np.random.Generator | int | None = None,
+    ) -> np.ndarray[int]:
+        """
+        Simulate measuring the (possibly mixed) state many times.
+
+        Args:
+            basis (str | np.ndarray): X, Y, Z or an arbitrary axis of the Bloch sphere. Defaults to Z.
+            shots (int): The number of measurements. Defaults to 1024.
+            rng (np.random.Generator | int | None): A generator or a seed, for reproducible results.
+
+        Returns:
+            np.ndarray[int]: The counts of the two outcomes (an Nx2 array for a batch).
+        """
+        return sample_counts(self.bloch_coordinates, basis, shots, rng)
+
+    def __len__(self) -> int:
+        assert self.is_batch, "A single density matrix has no length."
+
+        return self._rho.shape[0]
+
+    def __getitem__(self, index: int) -> Self:
+        """
+        Return a single density matrix of the batch.
+
+        Args:
+            index (int): The index of the density matrix to return.
+
+        Returns:
+            DensityMatrix: The density matrix at the given index.
+        """
+
+        assert self.is_batch, "Only a batch of density matrices can be indexed."
+
+        return DensityMatrix(self._rho[index])
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, DensityMatrix):
+            return False
+
+        return self._rho.shape == value.rho.shape and np.allclose(self._rho, value.rho)
+
+    def __repr__(self) -> str:
+        if self.is_batch:
+            return f"DensityMatrix({len(self)} states)"
+
+        return f"DensityMatrix({self._rho})"
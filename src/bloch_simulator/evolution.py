@@ -0,0 +1,242 @@
+"""
+Continuous-time evolution of states under a Hamiltonian H(t) = h_x(t) X + h_y(t) Y + h_z(t) Z (with ħ = 1).
+
+Over a short step dt, the Hamiltonian is taken to be constant, so the step is the exact rotation
+exp(-i H dt) = cos(|h| dt) I - i sin(|h| dt) (h / |h|)·σ, which turns the Bloch vector around h by 2 |h| dt.
+"""
+
+from typing import Callable, Iterable, Iterator
+import numpy as np
+from bloch_simulator.gate import PAULI_MATRICES
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+Hamiltonian = np.ndarray | Callable[[np.ndarray], np.ndarray]
+
+
+def propagators(h: np.ndarray, dt: float | np.ndarray) -> np.ndarray:
+    """Return the propagators exp(-i h·σ dt) of piecewise-constant Hamiltonians in closed form.
+
+    Args:
+        h (np.ndarray): The coefficients of the Pauli matrices, of shape Mx3.
+        dt (float | np.ndarray): The length of the steps, a scalar or of shape M.
+
+    Returns:
+        np.ndarray: The Mx2x2 array of propagators.
+    """
+
+    h = np.asarray(h, dtype=float).reshape(-1, 3)
+    dt = np.broadcast_to(np.asarray(dt, dtype=float), h.shape[:1])
+
+    angles = np.linalg.norm(h, axis=1) * dt
+    # sin(|h| dt) h / |h| = sinc(|h| dt) h dt, which is also fine when h = 0
+    sin_axes = (np.sinc(angles / np.pi) * dt)[:, None] * h
+
+    return np.cos(angles)[:, None, None] * np.eye(2) - 1j * np.tensordot(
+        sin_axes, PAULI_MATRICES, axes=1
+    )
+
+
+def _matmul_2x2(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Multiply stacks of 2x2 matrices entry by entry, which is much faster than np.matmul for such small matrices."""
+
+    out = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=complex)
+    out[..., 0, 0] = a[..., 0, 0] * b[..., 0, 0] + a[..., 0, 1] * b[..., 1, 0]
+    out[..., 0, 1] = a[..., 0, 0] * b[..., 0, 1] + a[..., 0, 1] * b[..., 1, 1]
+    out[..., 1, 0] = a[..., 1, 0] * b[..., 0, 0] + a[..., 1, 1] * b[..., 1, 0]
+    out[..., 1, 1] = a[..., 1, 0] * b[..., 0, 1] + a[..., 1, 1] * b[..., 1, 1]
+
+    return out
+
+
+def cumulative_product(matrices: np.ndarray) -> np.ndarray:
+    """Return the running products P_k = U_k ... U_1 U_0 of a sequence of 2x2 matrices.
+
+    The products are computed with a parallel prefix scan, so only log2(M) vectorized products are needed.
+
+    Args:
+        matrices (np.ndarray): The Mx2x2 array of matrices, in the order they are applied.
+
+    Returns:
+        np.ndarray: The Mx2x2 array of running products.
+    """
+
+    products = np.array(matrices, dtype=complex)
+    shift = 1
+
+    while shift < products.shape[0]:
+        # after this round, products[k] covers the steps (k - 2 shift, k]
+        products[shift:] = _matmul_2x2(products[shift:], products[:-shift])
+        shift *= 2
+
+    return products
+
+
+def _as_amplitudes(states: State | StateBatch) -> np.ndarray:
+    if isinstance(states, State):
+        return np.asarray(states.state, dtype=complex).reshape(1, 2)
+
+    return np.asarray(states.states, dtype=complex)
+
+
+def _bloch_coordinates(
+    running_products: np.ndarray, amplitudes: np.ndarray
+) -> np.ndarray:
+    evolved = np.einsum("mij,nj->mni", running_products, amplitudes)
+
+    return StateBatch(evolved.reshape(-1, 2)).bloch_coordinates.reshape(
+        evolved.shape[0], evolved.shape[1], 3
+    )
+
+
+def stream_running_products(
+    chunks: Iterable[np.ndarray], states: State | StateBatch, stride: int = 1
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Apply a sequence of 2x2 matrices to states one after the other, and stream the Bloch vectors after every stride-th one.
+
+    Within a chunk, the running products are computed with cumulative_product, and only the product of the whole chunk
+    is carried over to the next one. This is the loop of evolve and of bloch_simulator.streaming.
+
+    Args:
+        chunks (Iterable[np.ndarray]): The matrices in the order they are applied, in chunks of shape Mx2x2 (of any length).
+        states (State | StateBatch): The initial state(s).
+        stride (int): Only the Bloch vectors after every stride-th matrix are returned. Defaults to 1.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: The numbers of matrices applied at the kept steps (shape m) and the Bloch vectors
+            of the states after those steps (shape m x N x 3).
+    """
+
+    assert stride > 0, "The stride must be positive."
+
+    amplitudes = _as_amplitudes(states)
+    carry = np.eye(2, dtype=complex)
+    start = 0
+
+    for matrices in chunks:
+        running_products = _matmul_2x2(cumulative_product(matrices), carry)
+        carry = running_products[-1]
+
+        # the steps start + k + 1 that are multiples of the stride
+        kept = np.arange((-start - 1) % stride, len(matrices), stride)
+
+        if len(kept) > 0:
+            yield start + kept + 1, _bloch_coordinates(running_products[kept], amplitudes)
+
+        start += len(matrices)
+
+
+def evolve(
+    hamiltonian: Hamiltonian,
+    states: State | StateBatch,
+    dt: float,
+    n_steps: int | None = None,
+    t0: float = 0.0,
+    chunk_size: int = 1024,
+    stride: int = 1,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Evolve states under a piecewise-constant Hamiltonian and stream their Bloch trajectories.
+
+    The propagators of a whole chunk of steps are built and multiplied together at once,
+    and only the kept (every stride-th) steps are applied to the states (see stream_running_products).
+
+    Args:
+        hamiltonian (np.ndarray | Callable): Either an array of shape n_steps x 3 with the coefficients of X, Y and Z for each step,
+            or a function that maps an array of times to such an array. A function is evaluated at the middle of each step.
+        states (State | StateBatch): The initial state(s).
+        dt (float): The length of a step.
+        n_steps (int | None): The number of steps. Required if the Hamiltonian is a function.
+        t0 (float): The starting time. Defaults to 0.
+        chunk_size (int): The number of steps computed together. Defaults to 1024.
+        stride (int): Only every stride-th step is returned. Defaults to 1.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: The times of the kept steps (shape m) and the Bloch vectors of the states at those times (shape m x N x 3).
+    """
+
+    if callable(hamiltonian):
+        assert n_steps is not None, "The number of steps is required for a function."
+    else:
+        hamiltonian = np.asarray(hamiltonian, dtype=float).reshape(-1, 3)
+        n_steps = hamiltonian.shape[0] if n_steps is None else n_steps
+
+        assert n_steps <= hamiltonian.shape[0], "Not enough Hamiltonian steps."
+
+    assert chunk_size > 0 and stride > 0, "The chunk size and stride must be positive."
+
+    def chunks() -> Iterator[np.ndarray]:
+        for start in range(0, n_steps, chunk_size):
+            stop = min(start + chunk_size, n_steps)
+
+            if callable(hamiltonian):
+                h = hamiltonian(t0 + (np.arange(start, stop) + 0.5) * dt)
+            else:
+                h = hamiltonian[start:stop]
+
+            yield propagators(h, dt)
+
+    for steps, bloch_vectors in stream_running_products(chunks(), states, stride):
+        yield t0 + steps * dt, bloch_vectors
+
+
+def evolve_adaptive(
+    hamiltonian: Callable[[np.ndarray], np.ndarray],
+    states: State | StateBatch,
+    t_span: tuple[float, float],
+    tolerance: float = 1e-8,
+    initial_dt: float = 1e-3,
+    max_dt: float | None = None,
+    chunk_size: int = 1024,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Evolve states under a time-dependent Hamiltonian with adaptive step sizes, and stream their Bloch trajectories.
+
+    Each step uses the exponential midpoint rule. The error is estimated by comparing one step with two half steps
+    (step doubling), and the step size is adjusted to keep it below the tolerance. The error only depends on the
+    Hamiltonian, so all states share the same steps.
+
+    Args:
+        hamiltonian (Callable): A function that maps an array of times to the coefficients of X, Y and Z (shape len(t) x 3).
+        states (State | StateBatch): The initial state(s).
+        t_span (tuple[float, float]): The starting and the final time.
+        tolerance (float): The allowed error of a propagator per step. Defaults to 1e-8.
+        initial_dt (float): The length of the first attempted step. Defaults to 1e-3.
+        max_dt (float | None): The longest allowed step. Defaults to no limit.
+        chunk_size (int): The number of accepted steps returned together. Defaults to 1024.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: The times of the accepted steps (shape m) and the Bloch vectors of the states at those times (shape m x N x 3).
+    """
+
+    t, t_end = map(float, t_span)
+    dt = initial_dt
+    max_dt = t_end - t if max_dt is None else max_dt
+    amplitudes = _as_amplitudes(states)
+
+    carry = np.eye(2, dtype=complex)
+    times, products = [], []
+
+    while t < t_end:
+        dt = min(dt, max_dt, t_end - t)
+
+        h = hamiltonian(np.array([t + dt / 2, t + dt / 4, t + 3 * dt / 4]))
+        full_step, first_half, second_half = propagators(h, [dt, dt / 2, dt / 2])
+        half_steps = second_half @ first_half
+
+        error = np.abs(full_step - half_steps).max()
+
+        if error <= tolerance:
+            t += dt
+            carry = half_steps @ carry
+            times.append(t)
+            products.append(carry)
+
+            if len(times) == chunk_size:
+                yield np.array(times), _bloch_coordinates(np.array(products), amplitudes)
+                times, products = [], []
+
+        # the local error of the midpoint rule is O(dt^3)
+        factor = 0.9 * (tolerance / error) ** (1 / 3) if error > 0 else 2
+        dt *= min(2, max(0.2, factor))
+
+    if len(times) > 0:
+        yield np.array(times), _bloch_coordinates(np.array(products), amplitudes)
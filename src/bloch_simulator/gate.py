@@ -1,12 +1,300 @@
+from functools import cache, reduce
+import math
 import numpy as np
+from bloch_simulator.density_matrix import DensityMatrix
 from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+# Pauli X, Y and Z matrices, stacked along the first axis
+PAULI_MATRICES = np.array(
+    [
+        [[0, 1], [1, 0]],
+        [[0, -1j], [1j, 0]],
+        [[1, 0], [0, -1]],
+    ],
+    dtype=complex,
+)
+PAULI_MATRICES.flags.writeable = False
+
+
+def _read_only(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.array(matrix, dtype=complex)
+    matrix.flags.writeable = False
+    return matrix
+
+
+# canonical matrices of the named gates, shared by every Gate created by name
+NAMED_GATES = {
+    "I": _read_only(np.eye(2)),
+    "X": PAULI_MATRICES[0],
+    "Y": PAULI_MATRICES[1],
+    "Z": PAULI_MATRICES[2],
+    "H": _read_only(np.sqrt(0.5) * np.array([[1, 1], [1, -1]])),
+    "S": _read_only([[1, 0], [0, 1j]]),
+    "T": _read_only([[1, 0], [0, np.exp(1j * np.pi / 4)]]),
+    "S^†": _read_only([[1, 0], [0, -1j]]),
+    "T^†": _read_only([[1, 0], [0, np.exp(-1j * np.pi / 4)]]),
+}
+
+
+# the names recognized by __repr__: the named gates, then the products of at most three of H, S, T, X, Y, Z, S^†, T^†
+# (in this order), keeping only the first (shortest) name of every rotation. The list is precomputed, since
+# building it from all the products took about 25 ms on the first __repr__, e.g. at the startup of the application.
+_RECOGNIZED_NAMES = tuple(
+    (
+        "I X Y Z H S T S^† T^† H·S H·T H·X H·Y H·Z H·S^† H·T^† S·H S·T S·X S·Y T·H T·X T·Y T·Z X·T Y·T "
+        "S^†·H T^†·H H·S·H H·S·T H·S·X H·S·Y H·T·H H·T·X H·T·Y H·T·Z H·X·T H·Y·T H·S^†·H H·T^†·H S·H·T "
+        "S·H·Y S·H·Z S·H·S^† S·H·T^† S·T·H T·H·S T·H·T T·H·X T·H·Y T·H·Z T·H·S^† T·H·T^† X·T·H Y·T·H "
+        "S^†·H·S S^†·H·T S^†·H·T^† T^†·H·S T^†·H·T T^†·H·S^† T^†·H·T^†"
+    ).split()
+)
+_RECOGNITION_DECIMALS = 2
+_RECOGNITION_TOLERANCE = 1e-4
+
+
+def _bloch_rotation_matrix(axis: np.ndarray, angle: float) -> np.ndarray:
+    """Return the 3x3 rotation matrix of a rotation around an axis, with Rodrigues' formula.
+
+    Unlike the unitary, it does not depend on the global phase, and it is continuous in the gate.
+    """
+    # plain float arithmetic, this is called for every __repr__
+    x, y, z = map(float, axis)
+    c, s = math.cos(angle), math.sin(angle)
+    t = 1 - c
+
+    return np.array(
+        [
+            [c + t * x * x, t * x * y - s * z, t * x * z + s * y],
+            [t * x * y + s * z, c + t * y * y, t * y * z - s * x],
+            [t * x * z - s * y, t * y * z + s * x, c + t * z * z],
+        ]
+    )
+
+
+def _recognition_key(rotation: np.ndarray) -> bytes:
+    return np.rint(rotation * 10**_RECOGNITION_DECIMALS).astype(np.int8).tobytes()
+
+
+def _bloch_rotation_matrices(matrices: np.ndarray) -> np.ndarray:
+    """Return the 3x3 Bloch rotations R_ij = Re tr(σ_i U σ_j U†) / 2 of a stack of unitaries (shape Kx2x2)."""
+
+    return 0.5 * np.einsum(
+        "iab,kbc,jcd,kad->kij",
+        PAULI_MATRICES,
+        matrices,
+        PAULI_MATRICES,
+        np.conj(matrices),
+        optimize=True,
+    ).real
+
+
+@cache
+def _gate_recognition_index() -> dict[bytes, list[tuple[np.ndarray, str]]]:
+    """Build the index used by Gate.__repr__, which maps the rounded Bloch rotation of a gate to its name.
+
+    The rotations of all the names of _RECOGNIZED_NAMES are computed together.
+    """
+
+    matrices = np.array(
+        [
+            reduce(np.matmul, (NAMED_GATES[factor] for factor in name.split("·")))
+            for name in _RECOGNIZED_NAMES
+        ]
+    )
+    index = {}
+
+    for rotation, name in zip(_bloch_rotation_matrices(matrices), _RECOGNIZED_NAMES):
+        index.setdefault(_recognition_key(rotation), []).append((rotation, name))
+
+    return index
+
+
+def _recognize_gate(gate: "Gate") -> str | None:
+    """Return the name of the gate up to global phase, or None if it is not in the index."""
+
+    rotation = _bloch_rotation_matrix(gate.rotation_axis, gate.rotation_angle)
+
+    for other, name in _gate_recognition_index().get(_recognition_key(rotation), []):
+        if np.abs(rotation - other).max() <= _RECOGNITION_TOLERANCE:
+            return name
+
+    return None
+
+
+# a polyline this close to the arc is indistinguishable from it on the screen (half a pixel for a sphere
+# of radius 250 pixels, about its size in the application)
+DEFAULT_TRAJECTORY_TOLERANCE = 2e-3
+DEFAULT_TRAJECTORY_MAX_POINTS = 200
+
+
+def trajectory_num_points(
+    radius: float,
+    angle: float,
+    tolerance: float = DEFAULT_TRAJECTORY_TOLERANCE,
+    max_points: int = DEFAULT_TRAJECTORY_MAX_POINTS,
+) -> int:
+    """Return the number of evenly spaced points needed to draw an arc as a polyline within a tolerance.
+
+    A chord spanning the angle δ is r (1 - cos(δ/2)) away from the arc in the middle, so the steps can be
+    as large as 2 arccos(1 - tolerance / r).
+
+    Args:
+        radius (float): The radius of the arc.
+        angle (float): The angle of the arc.
+        tolerance (float): The largest distance of the polyline from the arc. Defaults to DEFAULT_TRAJECTORY_TOLERANCE.
+        max_points (int): The largest number of points. Defaults to DEFAULT_TRAJECTORY_MAX_POINTS.
+
+    Returns:
+        int: The number of points, including both ends, between 2 and max_points.
+    """
+
+    assert tolerance > 0, "The tolerance must be positive."
+    assert max_points >= 2, "A trajectory has at least two points."
+
+    if radius <= tolerance:
+        return 2
+
+    step = 2 * math.acos(1 - tolerance / radius)
+
+    return int(min(max(math.ceil(abs(angle) / step) + 1, 2), max_points))
+
+
+def _quaternion_decomposition(
+    quaternion: np.ndarray, phase: float
+) -> tuple[float, np.ndarray, float]:
+    """The decomposition of Gate._su2_decomposition, read directly from a quaternion."""
+
+    cos_half = float(quaternion[0])
+    sin_half_axis = quaternion[1:]
+
+    # -q is the same rotation, pick the sign that gives an angle in [0, π]
+    if cos_half < 0:
+        cos_half = -cos_half
+        sin_half_axis = -sin_half_axis
+        phase += math.pi
+
+    sin_half = float(np.linalg.norm(sin_half_axis))
+    angle = 2 * math.atan2(sin_half, cos_half)
+
+    if sin_half > 1e-12:
+        axis = sin_half_axis / sin_half
+    else:
+        # the identity (up to phase) has no distinguished axis
+        axis = np.array([0.0, 0.0, 1.0])
+
+    return math.remainder(phase, 2 * math.pi), axis, angle
+
+
+def _compose_quaternions(first: "Gate", second: "Gate") -> "Gate":
+    """The Hamilton product of two quaternion gates, with Python scalars (much faster than numpy on 4 elements)."""
+
+    p0, p1, p2, p3 = first._quaternion.tolist()
+    q0, q1, q2, q3 = second._quaternion.tolist()
+
+    product = [
+        p0 * q0 - p1 * q1 - p2 * q2 - p3 * q3,
+        p0 * q1 + p1 * q0 + p2 * q3 - p3 * q2,
+        p0 * q2 + p2 * q0 + p3 * q1 - p1 * q3,
+        p0 * q3 + p3 * q0 + p1 * q2 - p2 * q1,
+    ]
+    # renormalize, so that rounding errors do not build up over long chains
+    norm = math.hypot(*product)
+
+    quaternion = np.array([x / norm for x in product])
+
+    gate = Gate.__new__(Gate)
+    gate._matrix = None
+    gate._decomposition = None
+    gate._quaternion = quaternion
+    gate._phase = first._phase + second._phase
+
+    return gate
+
+
+def _evenly_spaced_rotation(
+    vector: np.ndarray, axis: np.ndarray, stop: float, n_points: int
+) -> np.ndarray:
+    """Rotate a Bloch vector around an axis by the angles np.linspace(0, stop, n_points), like Gate.rotate_bloch_vector.
+
+    With z = v_perp - i (n x v) and t = (p m + q) step, v(t) = v_par + Re(z e^(i t)) = v_par + Re(z e^(i p m step) e^(i q step)),
+    so only about 2 sqrt(n_points) exponentials are evaluated, and the points come out of a single (3K x 2) @ (2 x m) product,
+    which is much faster than np.cos and np.sin on every angle.
+    """
+
+    vector = np.asarray(vector, dtype=float)
+    axis = np.asarray(axis, dtype=float)
+    axis = axis / np.linalg.norm(axis)
+
+    # np.cross is slow on single vectors
+    (x, y, z), (u, v, w) = axis.tolist(), vector.tolist()
+    cross = np.array([y * w - z * v, z * u - x * w, x * v - y * u])
+    parallel = axis * np.dot(axis, vector)
+    perpendicular = vector - parallel
+
+    step = stop / (n_points - 1) if n_points > 1 else 0.0
+    block = math.isqrt(max(n_points - 1, 0)) + 1
+    n_blocks = -(-n_points // block)
+    fine = np.exp(1j * step * np.arange(block))
+    coarse = np.multiply.outer(
+        perpendicular - 1j * cross, np.exp(1j * step * block * np.arange(n_blocks))
+    )
+
+    # Re(a b) = Re(a) Re(b) - Im(a) Im(b)
+    left = np.stack([coarse.real, -coarse.imag], axis=-1).reshape(3 * n_blocks, 2)
+    points = (left @ np.stack([fine.real, fine.imag])).reshape(3, -1)[:, :n_points]
+    points += parallel[:, None]
+
+    return points
+
+
+def _matvec_into(matrix: np.ndarray, vector: np.ndarray, out: np.ndarray):
+    """Write matrix @ vector into out (which may be the vector itself) with Python scalars, so no temporary array
+    is allocated (only the Python complex numbers of the products)."""
+
+    m00, m01, m10, m11 = matrix.item(0), matrix.item(1), matrix.item(2), matrix.item(3)
+    alpha, beta = vector.item(0), vector.item(1)
+    out[0] = m00 * alpha + m01 * beta
+    out[1] = m10 * alpha + m11 * beta
+
+
+def quaternion_product(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Return the Hamilton products of quaternions (broadcast over ...x4 arrays).
+
+    With V = a I - i (b X + c Y + d Z), the product of the quaternions belongs to the matrix product.
+    """
+
+    p0, p1, p2, p3 = np.moveaxis(np.asarray(p, dtype=float), -1, 0)
+    q0, q1, q2, q3 = np.moveaxis(np.asarray(q, dtype=float), -1, 0)
+
+    return np.stack(
+        [
+            p0 * q0 - p1 * q1 - p2 * q2 - p3 * q3,
+            p0 * q1 + p1 * q0 + p2 * q3 - p3 * q2,
+            p0 * q2 + p2 * q0 + p3 * q1 - p1 * q3,
+            p0 * q3 + p3 * q0 + p1 * q2 - p2 * q1,
+        ],
+        axis=-1,
+    )
+
+
+def _quaternion_matrix(quaternion: np.ndarray, phase: float) -> np.ndarray:
+    a, b, c, d = quaternion.tolist()
+
+    return np.exp(1j * phase) * np.array(
+        [[complex(a, -d), complex(-c, -b)], [complex(c, -b), complex(a, d)]]
+    )
 
 
 class Gate:
     """
     A class to represent a quantum gate. It is represented by a unitary matrix.
+
+    A gate can also be stored as a unit quaternion and a global phase (see from_quaternion), U = e^(i phase) (a I - i (b X + c Y + d Z)).
+    Such gates are composed with the Hamilton product, and their matrix is only built when it is needed.
     """
 
+    __slots__ = ("_matrix", "_decomposition", "_quaternion", "_phase")
+
     def __init__(self, args):
         """
         Create a new gate.
@@ -15,7 +303,8 @@ class Gate:
             args: The gate can be created in different ways:
                 - With no arguments, the gate is the identity gate.
                 - With a numpy array of size 2x2.
-                - With a string representing the name of the gate: I, X, Y, Z, H.
+                - With a string representing the name of the gate: I, X, Y, Z, H, S, T, S^†, T^†.
+                  The matrices of the named gates are shared and read-only.
                 - With another gate.
 
         Raises:
@@ -23,10 +312,23 @@ class Gate:
 
         """
 
-        if isinstance(args, Gate):
-            self._matrix = args.U.copy()
+        # lazily computed (global phase, axis, angle), see _su2_decomposition
+        self._decomposition = None
+        # the quaternion backend, see from_quaternion
+        self._quaternion = None
+        self._phase = 0.0
+
+        if isinstance(args, Gate) and args._quaternion is not None:
+            # the quaternion is private and never mutated, so it can be shared
+            self._matrix = None
+            self._quaternion, self._phase = args._quaternion, args._phase
+            self._decomposition = args._decomposition
+        elif isinstance(args, Gate):
+            # read-only matrices are never mutated, so they can be shared
+            self._matrix = args.U if not args.U.flags.writeable else args.U.copy()
+            self._decomposition = args._decomposition
         elif args is None or len(args) == 0:
-            self._matrix = np.eye(2)
+            self._matrix = NAMED_GATES["I"]
         elif isinstance(args, np.ndarray):
             assert args.shape[0] == 2 and args.shape[1] == 2, "The matrix must be 2x2"
             # assert np.allclose(
@@ -35,84 +337,142 @@ class Gate:
 
             self._matrix = args
         elif isinstance(args, str):
-            if args == "I":
-                self._matrix = np.eye(2)
-            elif args == "X":
-                self._matrix = np.array([[0, 1], [1, 0]])
-            elif args == "Y":
-                self._matrix = np.array([[0, -1j], [1j, 0]])
-            elif args == "Z":
-                self._matrix = np.array([[1, 0], [0, -1]])
-            elif args == "H":
-                self._matrix = np.sqrt(0.5) * np.array([[1, 1], [1, -1]])
-            elif args == "S":
-                self._matrix = np.array([[1, 0], [0, 1j]])
-            elif args == "T":
-                self._matrix = np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]])
-            elif args == "S^†":
-                self._matrix = np.array([[1, 0], [0, -1j]])
-            elif args == "T^†":
-                self._matrix = np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]])
-            else:
+            if args not in NAMED_GATES:
                 raise ValueError("Invalid gate name.")
+
+            self._matrix = NAMED_GATES[args]
         else:
             raise ValueError("Invalid arguments.")
 
-    def apply(self, state: State) -> State:
+    def apply(
+        self,
+        state: State | StateBatch | DensityMatrix,
+        out: State | StateBatch | None = None,
+    ) -> State | StateBatch | DensityMatrix:
         """Apply the gate to a state. The state is a column vector of size 2, where the first element is the amplitude of |0> and the second element is the amplitude of |1>.
 
+        If a batch of states is given, the gate is applied to every state of the batch in a single matrix product.
+        If a density matrix is given, it is transformed to U ρ U†.
+
+        Args:
+            state (State | StateBatch | DensityMatrix): The state (or batch of states) to apply the gate to.
+            out (State | StateBatch | None): A state (or batch of the same length) to write the result into, instead of
+                allocating a new one. It may be the input itself. A read-only or non-complex array of out (e.g. the vector
+                of a named state) is replaced with a writable complex copy first. Not supported for density matrices.
+
+        Returns:
+            State | StateBatch | DensityMatrix: The new state (or batch of states) after applying the gate (out, if it is given).
+        """
+        if isinstance(state, StateBatch):
+            if out is None:
+                # each row is a state, so (U @ s^T)^T = s @ U^T
+                return StateBatch(state.states @ self.U.T)
+
+            if not out.states.flags.writeable or out.states.dtype != complex:
+                out.set_states(out.states.astype(complex))
+
+            np.matmul(state.states, self.U.T, out=out.states)
+            return out
+
+        if isinstance(state, DensityMatrix):
+            assert out is None, "Density matrices cannot be written into out."
+
+            return DensityMatrix(self.U @ state.rho @ np.conj(self.U).T)
+
+        if out is None:
+            return State(self.U @ state.state)
+
+        if not out.state.flags.writeable or out.state.dtype != complex:
+            out.set_state(out.state.astype(complex))
+
+        _matvec_into(self.U, state.state, out.state)
+        return out
+
+    def apply_(self, state: State | StateBatch) -> State | StateBatch:
+        """Apply the gate to a state (or batch of states) in place, without allocating a new state.
+
+        A read-only or non-complex array (e.g. the vector of a named state) is replaced with a writable complex copy first,
+        so the shared vectors are never modified.
+
         Args:
-            state (np.ndarray): The state to apply the gate to.
+            state (State | StateBatch): The state (or batch of states) to update.
 
         Returns:
-            np.ndarray: The new state after applying the gate.
+            State | StateBatch: The same state (or batch of states).
         """
-        return State(self._matrix @ state.state)
+        return self.apply(state, out=state)
 
     def set_matrix(self, matrix: np.ndarray):
         """
         Set the matrix that represents the gate.
+
+        The matrix is stored by reference and never modified in place, so shared read-only matrices stay intact.
         """
 
         self._matrix = matrix
+        self._decomposition = None
+        self._quaternion = None
+        self._phase = 0.0
 
-    def __mul__(self, state: State) -> State:
+    def __mul__(
+        self, state: State | StateBatch | DensityMatrix
+    ) -> State | StateBatch | DensityMatrix:
         """Apply the gate to a state using the * operator.
 
         Args:
-            state (State): The state to apply the gate to.
+            state (State | StateBatch | DensityMatrix): The state (or batch of states) to apply the gate to.
 
         Returns:
-            State: The new state after applying the gate.
+            State | StateBatch | DensityMatrix: The new state (or batch of states) after applying the gate.
         """
 
-        assert isinstance(state, State), "The state must be a State object."
+        assert isinstance(
+            state, (State, StateBatch, DensityMatrix)
+        ), "The state must be a State, StateBatch or DensityMatrix object."
 
         return self.apply(state)
 
-    def __matmul__(self, state: State) -> State:
+    def __matmul__(
+        self, state: "State | StateBatch | DensityMatrix | Gate"
+    ) -> "State | StateBatch | DensityMatrix | Gate":
         """Apply the gate to a state using the @ operator.
 
+        If the right operand is another gate, the two gates are composed instead, like matrices:
+        (A @ B) is the gate that first applies B and then A. If both gates use the quaternion backend,
+        they are composed with the Hamilton product, and so is the result.
+
         Args:
-            state (State): The state to apply the gate to.
+            state (State | StateBatch | DensityMatrix | Gate): The state (or batch of states) to apply the gate to, or the gate to compose with.
 
         Returns:
-            State: The new state after applying the gate.
+            State | StateBatch | DensityMatrix | Gate: The new state (or batch of states) after applying the gate, or the composed gate.
         """
 
-        assert isinstance(state, State), "The state must be a State object."
+        if isinstance(state, Gate):
+            if self._quaternion is not None and state._quaternion is not None:
+                return _compose_quaternions(self, state)
+
+            return Gate(self.U @ state.U)
+
+        assert isinstance(
+            state, (State, StateBatch, DensityMatrix)
+        ), "The state must be a State, StateBatch, DensityMatrix or Gate object."
 
         return self.apply(state)
 
-    def __call__(self, *args: State) -> State:
+    def __call__(
+        self, *args: State | StateBatch | DensityMatrix
+    ) -> State | StateBatch | DensityMatrix:
         """Apply the gate to a state using the () operator.
 
         Returns:
-            State: The new state after applying the gate.
+            State | StateBatch | DensityMatrix: The new state (or batch of states) after applying the gate.
         """
 
         assert len(args) == 1, "The gate must be applied to a single state."
-        assert isinstance(args[0], State), "The state must be a State object."
+        assert isinstance(
+            args[0], (State, StateBatch, DensityMatrix)
+        ), "The state must be a State, StateBatch or DensityMatrix object."
 
         return self.apply(args[0])
 
@@ -124,83 +484,255 @@ class Gate:
         Returns:
             np.ndarray: The matrix that represents the gate.
         """
+        if self._matrix is None:
+            # built once from the quaternion backend
+            self._matrix = _quaternion_matrix(self._quaternion, self._phase)
+
         return self._matrix
 
     @property
-    def rotation_axis(self):
-        """Return the axis of rotation of the gate in the Bloch sphere.
+    def quaternion(self) -> np.ndarray:
+        """
+        Return the unit quaternion (a, b, c, d) of the gate, where U = e^(i global_phase) (a I - i (b X + c Y + d Z)).
+
+        For a gate stored as a matrix, it is computed from the decomposition, so a >= 0.
+
+        Returns:
+            np.ndarray: The quaternion, a float array of size 4.
+        """
+        if self._quaternion is not None:
+            return self._quaternion.copy()
+
+        phase, axis, angle = self._su2_decomposition()
+
+        return np.array([math.cos(angle / 2), *(math.sin(angle / 2) * axis)])
+
+    @property
+    def is_quaternion(self) -> bool:
+        """Return whether the gate uses the quaternion backend (see from_quaternion)."""
+        return self._quaternion is not None
+
+    @staticmethod
+    def from_quaternion(quaternion: np.ndarray, phase: float = 0.0):
+        """Create a gate that uses the quaternion backend, U = e^(i phase) (a I - i (b X + c Y + d Z)).
+
+        Together with the phase, the quaternion holds the whole unitary, so Gate.from_quaternion(g.quaternion, g.global_phase).U
+        is g.U (up to rounding) for every unitary gate g.
+
+        Args:
+            quaternion (np.ndarray): The quaternion (a, b, c, d). It is normalized.
+            phase (float): The global phase. Defaults to 0.
+
+        Returns:
+            Gate: The gate.
+        """
+
+        quaternion = np.array(quaternion, dtype=float)
+        assert quaternion.shape == (4,), "The quaternion must have four components."
+
+        quaternion /= np.linalg.norm(quaternion)
+
+        gate = Gate.__new__(Gate)
+        gate._matrix = None
+        gate._decomposition = None
+        gate._quaternion = quaternion
+        gate._phase = float(phase)
+
+        return gate
+
+    def to_quaternion(self):
+        """
+        Return the same gate with the quaternion backend.
 
         Returns:
-            np.ndarray: The axis of rotation.
+            Gate: The gate, stored as a quaternion and a global phase.
         """
 
-        _, eigenvectors = np.linalg.eig(self._matrix)
+        if self._quaternion is not None:
+            return self
+
+        return Gate.from_quaternion(self.quaternion, self.global_phase)
+
+    def _su2_decomposition(self) -> tuple[float, np.ndarray, float]:
+        """Decompose the gate as U = e^(i phase) (cos(angle/2) I - i sin(angle/2) n·σ).
+
+        The decomposition is computed in closed form from the matrix entries and cached until the matrix is changed with set_matrix.
+        The angle is chosen to be in [0, π], so that the rotation always takes the shorter way around the axis.
+
+        Returns:
+            tuple[float, np.ndarray, float]: The global phase, the (normalized) axis and the angle of rotation.
+        """
+
+        if self._decomposition is not None:
+            return self._decomposition
+
+        if self._quaternion is not None:
+            self._decomposition = _quaternion_decomposition(self._quaternion, self._phase)
+            return self._decomposition
+
+        (u00, u01), (u10, u11) = np.asarray(self._matrix, dtype=complex)
 
-        a = eigenvectors[:, 0][0]
-        b = eigenvectors[:, 0][1]
-        c = eigenvectors[:, 1][0]
-        d = eigenvectors[:, 1][1]
+        # divide by the square root of the determinant to get a matrix in SU(2)
+        phase = float(np.angle(u00 * u11 - u01 * u10)) / 2
+        v00, v01, v10, v11 = np.exp(-1j * phase) * np.array([u00, u01, u10, u11])
 
-        off_diagonal = c * np.conj(d) - a * np.conj(b)
+        cos_half = float((v00 + v11).real) / 2
+        sin_half_axis = np.array(
+            [
+                -(v01 + v10).imag / 2,
+                (v10 - v01).real / 2,
+                -(v00 - v11).imag / 2,
+            ]
+        )
 
-        x = np.real(off_diagonal)
-        y = -1 * np.imag(off_diagonal)
-        z = np.abs(c) ** 2 - np.abs(a) ** 2
+        # -V is the same rotation, pick the sign that gives an angle in [0, π]
+        if cos_half < 0:
+            cos_half = -cos_half
+            sin_half_axis = -sin_half_axis
+            phase += np.pi
+
+        sin_half = float(np.linalg.norm(sin_half_axis))
+        angle = 2 * float(np.arctan2(sin_half, cos_half))
+
+        if sin_half > 1e-12:
+            axis = sin_half_axis / sin_half
+        else:
+            # the identity (up to phase) has no distinguished axis
+            axis = np.array([0.0, 0.0, 1.0])
 
-        return np.array([x, y, z])
+        phase = float(np.angle(np.exp(1j * phase)))
+
+        self._decomposition = (phase, axis, angle)
+
+        return self._decomposition
 
     @property
-    def rotation_angle(self) -> float:
+    def global_phase(self) -> float:
+        """Return the global phase of the gate, which does not affect the Bloch sphere.
+
+        Returns:
+            float: The global phase.
         """
-        Return the angle of rotation of the gate in the Bloch sphere.
 
-        Raises:
-            ValueError: If the matrix does not have two eigenvalues.
+        return self._su2_decomposition()[0]
+
+    @property
+    def rotation_axis(self) -> np.ndarray:
+        """Return the axis of rotation of the gate in the Bloch sphere.
 
         Returns:
-            float: The angle of rotation.
+            np.ndarray: The (normalized) axis of rotation.
         """
 
-        eigenvalues, _ = np.linalg.eig(self._matrix)
+        return self._su2_decomposition()[1].copy()
 
-        if eigenvalues is None or len(eigenvalues) != 2:
-            raise ValueError("The matrix must have two eigenvalues!")
+    @property
+    def rotation_angle(self) -> float:
+        """
+        Return the angle of rotation of the gate in the Bloch sphere.
+
+        Returns:
+            float: The angle of rotation, in [0, π].
+        """
 
-        return float(np.angle(eigenvalues[0]) - np.angle(eigenvalues[1]))
+        return self._su2_decomposition()[2]
 
     def calculate_trajectory(self, state_from: State, n_points: int):
         """Calculates the trajectory of a gate applied to a state in the Bloch sphere.
 
+        The points are computed all at once by rotating the starting Bloch vector around the rotation axis with Rodrigues' rotation formula.
+        The angles are evenly spaced, so their cosines and sines come from a few exponentials (see _evenly_spaced_rotation).
+
         Args:
-            gate (Gate): The gate to apply.
-            state_from (np.ndarray): The starting state.
+            state_from (State): The starting state.
             n_points (int): The number of points to calculate.
 
         Returns:
             np.ndarray: The points in the Bloch sphere. Each column is a point in Cartesian coordinates.
         """
 
-        t = np.linspace(0, self.rotation_angle, n_points)
+        return _evenly_spaced_rotation(
+            state_from.bloch_coordinates,
+            self.rotation_axis,
+            self.rotation_angle,
+            n_points,
+        )
+
+    def calculate_adaptive_trajectory(
+        self,
+        state_from: State,
+        tolerance: float = DEFAULT_TRAJECTORY_TOLERANCE,
+        max_points: int = DEFAULT_TRAJECTORY_MAX_POINTS,
+    ) -> np.ndarray:
+        """Calculates the trajectory of a gate applied to a state with as few points as the tolerance allows.
 
-        points = list(
-            map(
-                lambda p: p.bloch_coordinates,
-                [
-                    Gate.from_rotation(self.rotation_axis, _t).apply(state_from)
-                    for _t in t
-                ],
-            )
+        The points are evenly spaced along the arc, and there are just enough of them for the polyline to stay
+        within the tolerance of the arc (see trajectory_num_points), so small rotations get few points.
+
+        Args:
+            state_from (State): The starting state.
+            tolerance (float): The largest distance of the polyline from the arc, in Bloch sphere units
+                (the sphere has radius 1). Defaults to DEFAULT_TRAJECTORY_TOLERANCE.
+            max_points (int): The largest number of points. Defaults to DEFAULT_TRAJECTORY_MAX_POINTS.
+
+        Returns:
+            np.ndarray: The points in the Bloch sphere, as float32. Each column is a point in Cartesian coordinates.
+        """
+
+        vector = state_from.bloch_coordinates
+        axis = self.rotation_axis
+        angle = self.rotation_angle
+
+        # the arc is a circle around the axis (a unit vector), its radius is the distance of the vector from the axis
+        along_axis = float(np.dot(axis, vector))
+        radius = math.sqrt(max(float(np.dot(vector, vector)) - along_axis**2, 0.0))
+        n_points = trajectory_num_points(radius, angle, tolerance, max_points)
+
+        return _evenly_spaced_rotation(vector, axis, angle, n_points).astype(
+            np.float32
         )
 
-        return np.array(points).T
+    @staticmethod
+    def rotate_bloch_vector(
+        vector: np.ndarray, axis: np.ndarray, angles: np.ndarray
+    ) -> np.ndarray:
+        """Rotate a Bloch vector around an axis by each of the given angles, using Rodrigues' rotation formula.
+
+        Args:
+            vector (np.ndarray): The Bloch vector to rotate.
+            axis (np.ndarray): The axis of rotation. It does not need to be normalized.
+            angles (np.ndarray): The angles of rotation.
+
+        Returns:
+            np.ndarray: The rotated vectors. Each column belongs to one angle.
+        """
+
+        vector = np.asarray(vector, dtype=float)
+        axis = np.asarray(axis, dtype=float)
+        axis = axis / np.linalg.norm(axis)
+        angles = np.asarray(angles, dtype=float)
+
+        # np.cross is slow on single vectors
+        (x, y, z), (u, v, w) = axis.tolist(), vector.tolist()
+        cross = np.array([y * w - z * v, z * u - x * w, x * v - y * u])
+        parallel = axis * np.dot(axis, vector)
+        perpendicular = vector - parallel
+
+        # v(t) = v_par + v_perp cos(t) + (n x v) sin(t), accumulated in place
+        points = np.multiply.outer(perpendicular, np.cos(angles))
+        points += np.multiply.outer(cross, np.sin(angles))
+        points += parallel[:, None]
+
+        return points
 
     @staticmethod
-    def from_rotation(axis: np.ndarray, angle: float):
+    def from_rotation(axis: np.ndarray, angle: float, backend: str = "matrix"):
         """Create a gate that represents a rotation around an axis.
 
         Args:
             axis (np.ndarray): The axis of rotation.
             angle (float): The angle of rotation.
+            backend (str): "matrix" or "quaternion" (see from_quaternion). Defaults to "matrix".
 
         Raises:
             AssertionError: If the axis does not have three components.
@@ -210,46 +742,32 @@ class Gate:
         """
 
         assert len(axis) == 3, "The axis must have three components."
+        assert backend in ("matrix", "quaternion"), "Invalid backend."
 
         # normalize the axis
         normalized_axis = axis / np.linalg.norm(axis)
 
-        x, y, z = normalized_axis
-
-        sigma = np.array(
-            [
-                np.array([[0, 1], [1, 0]]),
-                np.array([[0, -1j], [1j, 0]]),
-                np.array([[1, 0], [0, -1]]),
-            ]
-        )
+        if backend == "quaternion":
+            return Gate.from_quaternion(
+                [math.cos(angle / 2), *(math.sin(angle / 2) * normalized_axis)]
+            )
 
         return Gate(
             np.cos(angle / 2) * np.eye(2)
-            - 1j * np.sin(angle / 2) * (x * sigma[0] + y * sigma[1] + z * sigma[2])
+            - 1j
+            * np.sin(angle / 2)
+            * np.tensordot(normalized_axis, PAULI_MATRICES, axes=1)
         )
 
     def __repr__(self) -> str:
-        if np.allclose(self.U, np.eye(2), atol=1e-4):
-            return "I"
-        if np.allclose(self.U, np.array([[0, 1], [1, 0]]), atol=1e-4):
-            return "X"
-        if np.allclose(self.U, np.array([[0, -1j], [1j, 0]]), atol=1e-4):
-            return "Y"
-        if np.allclose(self.U, np.array([[1, 0], [0, -1]]), atol=1e-4):
-            return "Z"
-        if np.allclose(self.U, np.sqrt(0.5) * np.array([[1, 1], [1, -1]]), atol=1e-4):
-            return "H"
-        if np.allclose(self.U, np.array([[1, 0], [0, 1j]]), atol=1e-4):
-            return "S"
-        if np.allclose(
-            self.U, np.array([[1, 0], [0, np.exp(1j * np.pi / 4)]]), atol=1e-4
-        ):
-            return "T"
-        if np.allclose(self.U, np.array([[1, 0], [0, -1j]]), atol=1e-4):
-            return "S^†"
-        if np.allclose(
-            self.U, np.array([[1, 0], [0, np.exp(-1j * np.pi / 4)]]), atol=1e-4
-        ):
-            return "T^†"
+        """Return the name of the gate, if it is a named gate or a short product of them (up to global phase).
+
+        Products are written like matrix products, so "H·T" first applies T and then H.
+        """
+
+        name = _recognize_gate(self)
+
+        if name is not None:
+            return name
+
         return f"U({self.U})"
@@ -0,0 +1,195 @@
+from typing import Iterable, Self
+import numpy as np
+from bloch_simulator.gate import Gate, PAULI_MATRICES
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+
+class GateBatch:
+    """
+    A class to represent a batch of quantum gates. It is represented by a Kx2x2 complex array, where each entry is a unitary matrix.
+    """
+
+    def __init__(self, gates: np.ndarray | Iterable[Gate] | Self):
+        """
+        Create a new batch of gates.
+
+        Args:
+            gates: The batch can be given in different ways:
+                - With a numpy array of shape Kx2x2.
+                - With another batch.
+                - With an iterable of Gate objects.
+
+        Raises:
+            ValueError: If the arguments are invalid.
+        """
+        if isinstance(gates, GateBatch):
+            self._matrices = gates.matrices.copy()
+        elif isinstance(gates, np.ndarray):
+            assert (
+                gates.ndim == 3 and gates.shape[1:] == (2, 2)
+            ), "The matrices must be an array of shape Kx2x2."
+            self._matrices = gates
+        elif isinstance(gates, Iterable):
+            gates = list(gates)
+            assert all(
+                isinstance(g, Gate) for g in gates
+            ), "All elements must be Gate objects."
+            self._matrices = np.array([g.U for g in gates], dtype=complex).reshape(
+                -1, 2, 2
+            )
+        else:
+            raise ValueError("Invalid arguments.")
+
+    @property
+    def matrices(self) -> np.ndarray:
+        """
+        Return the matrices of the gates.
+
+        Returns:
+            np.ndarray: The Kx2x2 array of matrices.
+        """
+        return self._matrices
+
+    def apply(self, state: State | StateBatch) -> StateBatch:
+        """Apply every gate of the batch in a single call.
+
+        Args:
+            state (State | StateBatch): If a single state is given, every gate is applied to it.
+                If a batch of K states is given, the k-th gate is applied to the k-th state.
+
+        Raises:
+            AssertionError: If the batch of states does not have as many states as there are gates.
+
+        Returns:
+            StateBatch: The K new states.
+        """
+        if isinstance(state, StateBatch):
+            assert len(state) == len(
+                self
+            ), "The number of states must match the number of gates."
+            return StateBatch(np.einsum("kij,kj->ki", self._matrices, state.states))
+
+        return StateBatch(self._matrices @ state.state)
+
+    def __matmul__(self, state: State | StateBatch) -> StateBatch:
+        """Apply the gates using the @ operator.
+
+        Args:
+            state (State | StateBatch): The state (or batch of states) to apply the gates to.
+
+        Returns:
+            StateBatch: The new states after applying the gates.
+        """
+
+        assert isinstance(
+            state, (State, StateBatch)
+        ), "The state must be a State or StateBatch object."
+
+        return self.apply(state)
+
+    def __call__(self, *args: State | StateBatch) -> StateBatch:
+        """Apply the gates using the () operator.
+
+        Returns:
+            StateBatch: The new states after applying the gates.
+        """
+
+        assert len(args) == 1, "The gates must be applied to a single argument."
+        assert isinstance(
+            args[0], (State, StateBatch)
+        ), "The state must be a State or StateBatch object."
+
+        return self.apply(args[0])
+
+    def __len__(self) -> int:
+        return self._matrices.shape[0]
+
+    def __getitem__(self, index: int) -> Gate:
+        """
+        Return a single gate of the batch.
+
+        Args:
+            index (int): The index of the gate to return.
+
+        Returns:
+            Gate: The gate at the given index.
+        """
+        return Gate(self._matrices[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"GateBatch({len(self)} gates)"
+
+    @staticmethod
+    def from_rotation(axes: np.ndarray, angles: np.ndarray | float) -> Self:
+        """Create a batch of rotation gates.
+
+        The axes and the angles are broadcast against each other, so a single axis can be swept over many angles and vice versa.
+
+        Args:
+            axes (np.ndarray): The axes of rotation, of shape 3 or Kx3. They do not need to be normalized.
+            angles (np.ndarray | float): The angles of rotation, a scalar or of shape K.
+
+        Raises:
+            AssertionError: If the axes do not have three components.
+
+        Returns:
+            GateBatch: The K rotation gates.
+        """
+
+        axes = np.asarray(axes, dtype=float)
+        angles = np.asarray(angles, dtype=float)
+
+        assert axes.shape[-1] == 3, "The axes must have three components."
+
+        axes = axes / np.linalg.norm(axes, axis=-1, keepdims=True)
+        axes, angles = np.broadcast_arrays(axes.reshape(-1, 3), angles.reshape(-1, 1))
+
+        half_angles = angles[:, 0] / 2
+
+        return GateBatch(
+            np.cos(half_angles)[:, None, None] * np.eye(2)
+            - 1j
+            * np.sin(half_angles)[:, None, None]
+            * np.tensordot(axes, PAULI_MATRICES, axes=1)
+        )
+
+    @staticmethod
+    def rx(angles: np.ndarray | float) -> Self:
+        """Create a batch of rotations around the X axis.
+
+        Args:
+            angles (np.ndarray | float): The angles of rotation.
+
+        Returns:
+            GateBatch: The rotation gates.
+        """
+        return GateBatch.from_rotation(np.array([1, 0, 0]), angles)
+
+    @staticmethod
+    def ry(angles: np.ndarray | float) -> Self:
+        """Create a batch of rotations around the Y axis.
+
+        Args:
+            angles (np.ndarray | float): The angles of rotation.
+
+        Returns:
+            GateBatch: The rotation gates.
+        """
+        return GateBatch.from_rotation(np.array([0, 1, 0]), angles)
+
+    @staticmethod
+    def rz(angles: np.ndarray | float) -> Self:
+        """Create a batch of rotations around the Z axis.
+
+        Args:
+            angles (np.ndarray | float): The angles of rotation.
+
+        Returns:
+            GateBatch: The rotation gates.
+        """
+        return GateBatch.from_rotation(np.array([0, 0, 1]), angles)
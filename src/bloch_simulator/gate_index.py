@@ -0,0 +1,177 @@
+import heapq
+from typing import Iterable
+import numpy as np
+from bloch_simulator.decomposition import quaternions
+from bloch_simulator.gate import Gate
+from bloch_simulator.gate_batch import GateBatch
+
+# squared distances this close to 2 are treated as equal, when deciding which copy of a gate counts
+_TIE_TOLERANCE = 1e-9
+
+
+class GateIndex:
+    """
+    A k-d tree over the quaternions of a library of gates, for finding the gates closest to a given one (up to global phase).
+
+    The distance is the one of bloch_simulator.decomposition.distance, the Euclidean distance of the quaternions with matching
+    signs. Both signs of every quaternion are stored in the tree, so that the Euclidean nearest neighbors are the nearest gates.
+    """
+
+    def __init__(
+        self, gates: GateBatch | np.ndarray | Iterable[Gate], leaf_size: int = 32
+    ):
+        """
+        Build the index.
+
+        Args:
+            gates (GateBatch | np.ndarray | Iterable[Gate]): The gates, as a batch, an array of shape Kx2x2 or an iterable of gates.
+            leaf_size (int): The largest number of points in a leaf of the tree. Defaults to 32.
+        """
+
+        if not isinstance(gates, (GateBatch, np.ndarray)):
+            gates = GateBatch(gates)
+
+        self._build(quaternions(gates).reshape(-1, 4), leaf_size)
+
+    @staticmethod
+    def from_quaternions(
+        gate_quaternions: np.ndarray, leaf_size: int = 32
+    ) -> "GateIndex":
+        """Build the index from the quaternions of the gates (see quaternions), e.g. of a Clifford+T table.
+
+        Args:
+            gate_quaternions (np.ndarray): The unit quaternions, of shape Kx4.
+            leaf_size (int): The largest number of points in a leaf of the tree. Defaults to 32.
+
+        Returns:
+            GateIndex: The index.
+        """
+
+        index = GateIndex.__new__(GateIndex)
+        index._build(np.asarray(gate_quaternions, dtype=float).reshape(-1, 4), leaf_size)
+
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _build(self, gate_quaternions: np.ndarray, leaf_size: int):
+        self._size = len(gate_quaternions)
+
+        points = np.concatenate([gate_quaternions, -gate_quaternions])
+        order = np.arange(len(points))
+
+        # the nodes are stored in flat lists, a leaf has the split dimension -1
+        dims, splits, children, ranges = [], [], [], []
+
+        def build(start: int, end: int) -> int:
+            node = len(dims)
+            dims.append(-1)
+            splits.append(0.0)
+            children.append((-1, -1))
+            ranges.append((start, end))
+
+            if end - start <= leaf_size:
+                return node
+
+            segment = order[start:end]
+            coordinates = points[segment]
+            dim = int(np.argmax(np.ptp(coordinates, axis=0)))
+            middle = (end - start) // 2
+
+            order[start:end] = segment[
+                np.argpartition(coordinates[:, dim], middle)
+            ]
+
+            dims[node] = dim
+            splits[node] = float(points[order[start + middle], dim])
+            left = build(start, start + middle)
+            right = build(start + middle, end)
+            children[node] = (left, right)
+
+            return node
+
+        build(0, len(points))
+
+        self._points = points[order]
+        # the index of the gate, and whether it is the negative copy
+        self._ids = order % self._size
+        self._negated = order >= self._size
+        self._dims, self._splits = dims, splits
+        self._children, self._ranges = children, ranges
+
+    def query(
+        self, gates: Gate | GateBatch | np.ndarray, k: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the k gates of the library closest to each of the given gates.
+
+        Args:
+            gates (Gate | GateBatch | np.ndarray): The gate(s) to look up, a gate, a batch or an array of shape 2x2 or Kx2x2.
+            k (int): The number of neighbors. Defaults to 1.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The distances and the indices of the neighbors, closest first,
+                of shape k (or Kxk for several gates).
+        """
+
+        k = min(k, self._size)
+        targets = quaternions(gates)
+
+        distances = np.empty(targets.shape[:-1] + (k,))
+        indices = np.empty(targets.shape[:-1] + (k,), dtype=int)
+
+        for i in np.ndindex(targets.shape[:-1]):
+            distances[i], indices[i] = self._query_one(targets[i], k)
+
+        return distances, indices
+
+    def _query_one(self, target: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        # max-heap of the k best (negative squared distance, gate index)
+        best = []
+        target_list = target.tolist()
+
+        def bound() -> float:
+            # the distance of two gates is at most sqrt(2), the other copy of a gate is always further
+            return -best[0][0] if len(best) == k else 2.0 + _TIE_TOLERANCE
+
+        def search(node: int):
+            dim = self._dims[node]
+
+            if dim < 0:
+                start, end = self._ranges[node]
+                squared = np.sum((self._points[start:end] - target) ** 2, axis=1)
+
+                for j in np.flatnonzero(squared <= bound()):
+                    # the squared distances of the two copies add up to 4, the nearer one counts,
+                    # at sqrt(2) both copies are equally far and only the positive one counts
+                    if squared[j] > 2.0 + _TIE_TOLERANCE or (
+                        squared[j] >= 2.0 - _TIE_TOLERANCE and self._negated[start + j]
+                    ):
+                        continue
+
+                    entry = (-float(squared[j]), int(self._ids[start + j]))
+
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry[0] > best[0][0]:
+                        heapq.heapreplace(best, entry)
+
+                return
+
+            difference = target_list[dim] - self._splits[node]
+            left, right = self._children[node]
+            near, far = (left, right) if difference < 0 else (right, left)
+
+            search(near)
+
+            if difference * difference <= bound():
+                search(far)
+
+        search(0)
+
+        best.sort(reverse=True)
+
+        return (
+            np.sqrt([-squared for squared, _ in best]),
+            np.array([index for _, index in best], dtype=int),
+        )
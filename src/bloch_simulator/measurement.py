@@ -0,0 +1,85 @@
+import numpy as np
+
+# axes of the named measurement bases, the first outcome is the +1 eigenstate of the axis
+MEASUREMENT_BASES = {
+    "X": np.array([1.0, 0.0, 0.0]),
+    "Y": np.array([0.0, 1.0, 0.0]),
+    "Z": np.array([0.0, 0.0, 1.0]),
+}
+
+
+def measurement_axis(basis: str | np.ndarray) -> np.ndarray:
+    """Return the (normalized) Bloch axis of a measurement basis.
+
+    Args:
+        basis (str | np.ndarray): X, Y, Z or an arbitrary axis of the Bloch sphere.
+
+    Raises:
+        ValueError: If the basis is not a known name or a three component axis.
+
+    Returns:
+        np.ndarray: The normalized axis.
+    """
+
+    if isinstance(basis, str):
+        if basis not in MEASUREMENT_BASES:
+            raise ValueError("Invalid basis name.")
+
+        return MEASUREMENT_BASES[basis]
+
+    axis = np.asarray(basis, dtype=float)
+
+    if axis.shape != (3,) or np.linalg.norm(axis) == 0:
+        raise ValueError("The basis must be X, Y, Z or a non-zero axis.")
+
+    return axis / np.linalg.norm(axis)
+
+
+def outcome_probabilities(
+    bloch_coordinates: np.ndarray, basis: str | np.ndarray = "Z"
+) -> np.ndarray:
+    """Return the probabilities of the two outcomes of a measurement.
+
+    The first outcome is the state pointing along the axis (|0> for Z), its probability is (1 + n·r) / 2.
+
+    Args:
+        bloch_coordinates (np.ndarray): The Bloch vector of shape 3, or Nx3 for a batch.
+        basis (str | np.ndarray): The measurement basis. Defaults to Z.
+
+    Returns:
+        np.ndarray: The probabilities, of shape 2 (or Nx2).
+    """
+
+    p_first = np.clip((1 + bloch_coordinates @ measurement_axis(basis)) / 2, 0, 1)
+
+    return np.stack([p_first, 1 - p_first], axis=-1)
+
+
+def sample_counts(
+    bloch_coordinates: np.ndarray,
+    basis: str | np.ndarray = "Z",
+    shots: int = 1024,
+    rng: np.random.Generator | int | None = None,
+) -> np.ndarray:
+    """Simulate repeated measurements and count the outcomes.
+
+    The shots of every state are drawn with a single binomial call, so the cost does not depend on the number of shots.
+
+    Args:
+        bloch_coordinates (np.ndarray): The Bloch vector of shape 3, or Nx3 for a batch.
+        basis (str | np.ndarray): The measurement basis. Defaults to Z.
+        shots (int): The number of measurements per state. Defaults to 1024.
+        rng (np.random.Generator | int | None): A generator or a seed, for reproducible results. Defaults to a fresh generator.
+
+    Returns:
+        np.ndarray: The counts of the two outcomes, of shape 2 (or Nx2).
+    """
+
+    assert shots >= 0, "The number of shots must be non-negative."
+
+    rng = np.random.default_rng(rng)
+    p_first = outcome_probabilities(bloch_coordinates, basis)[..., 0]
+
+    n_first = rng.binomial(shots, p_first)
+
+    return np.stack([n_first, shots - n_first], axis=-1)
@@ -0,0 +1,121 @@
+"""
+Distances and fidelities of states and gates, computed for whole batches at once.
+
+States are compared through their Bloch vectors r and s, which covers pure and mixed states alike.
+Gates are compared up to the global phase through c = |tr(U†V)| / 2, the overlap of their quaternions
+(see bloch_simulator.decomposition).
+"""
+
+import numpy as np
+from bloch_simulator.density_matrix import DensityMatrix
+from bloch_simulator.gate import Gate
+from bloch_simulator.gate_batch import GateBatch
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+from bloch_simulator.decomposition import quaternions
+
+States = State | StateBatch | DensityMatrix | np.ndarray
+Gates = Gate | GateBatch | np.ndarray
+
+
+def _bloch_vectors(states: States) -> np.ndarray:
+    if isinstance(states, (State, StateBatch, DensityMatrix)):
+        return states.bloch_coordinates
+
+    # an array of Bloch vectors
+    states = np.asarray(states, dtype=float)
+    assert states.shape[-1] == 3, "The Bloch vectors must have three components."
+
+    return states
+
+
+def _result(values: np.ndarray) -> float | np.ndarray:
+    return float(values) if np.ndim(values) == 0 else values
+
+
+def state_fidelity(a: States, b: States) -> float | np.ndarray:
+    """Return the fidelity F = (tr sqrt(sqrt(ρ) σ sqrt(ρ)))^2 of states, which is |<ψ|φ>|^2 for pure states.
+
+    For a qubit it is (1 + r·s + sqrt((1 - |r|^2)(1 - |s|^2))) / 2. The arguments are broadcast against each other.
+
+    Args:
+        a (State | StateBatch | DensityMatrix | np.ndarray): The first state(s), or their Bloch vectors.
+        b (State | StateBatch | DensityMatrix | np.ndarray): The second state(s), or their Bloch vectors.
+
+    Returns:
+        float | np.ndarray: The fidelity (or the fidelities of the batch), in [0, 1].
+    """
+
+    r, s = _bloch_vectors(a), _bloch_vectors(b)
+
+    mixedness = (1 - np.sum(r * r, axis=-1)) * (1 - np.sum(s * s, axis=-1))
+
+    return _result(
+        np.clip((1 + np.sum(r * s, axis=-1) + np.sqrt(np.maximum(mixedness, 0))) / 2, 0, 1)
+    )
+
+
+def trace_distance(a: States, b: States) -> float | np.ndarray:
+    """Return the trace distance ||ρ - σ||_1 / 2 of states, which is half the distance of their Bloch vectors.
+
+    Args:
+        a (State | StateBatch | DensityMatrix | np.ndarray): The first state(s), or their Bloch vectors.
+        b (State | StateBatch | DensityMatrix | np.ndarray): The second state(s), or their Bloch vectors.
+
+    Returns:
+        float | np.ndarray: The trace distance (or the distances of the batch), in [0, 1].
+    """
+
+    return _result(np.linalg.norm(_bloch_vectors(a) - _bloch_vectors(b), axis=-1) / 2)
+
+
+def _gate_overlaps(a: Gates, b: Gates) -> np.ndarray:
+    # |tr(U†V)| / 2, without the global phase
+    return np.minimum(np.abs(np.sum(quaternions(a) * quaternions(b), axis=-1)), 1)
+
+
+def process_fidelity(a: Gates, b: Gates) -> float | np.ndarray:
+    """Return the process (entanglement) fidelity |tr(U†V)|^2 / 4 of gates.
+
+    Args:
+        a (Gate | GateBatch | np.ndarray): The first gate(s).
+        b (Gate | GateBatch | np.ndarray): The second gate(s).
+
+    Returns:
+        float | np.ndarray: The process fidelity (or the fidelities of the batch), in [0, 1].
+    """
+
+    return _result(_gate_overlaps(a, b) ** 2)
+
+
+def gate_fidelity(a: Gates, b: Gates) -> float | np.ndarray:
+    """Return the average gate fidelity of gates, the fidelity of U|ψ> and V|ψ> averaged over all states |ψ>.
+
+    For a qubit it is (2 F_pro + 1) / 3, where F_pro is the process fidelity.
+
+    Args:
+        a (Gate | GateBatch | np.ndarray): The first gate(s).
+        b (Gate | GateBatch | np.ndarray): The second gate(s).
+
+    Returns:
+        float | np.ndarray: The average gate fidelity (or the fidelities of the batch), in [1/3, 1].
+    """
+
+    return _result((2 * _gate_overlaps(a, b) ** 2 + 1) / 3)
+
+
+def diamond_distance(a: Gates, b: Gates) -> float | np.ndarray:
+    """Return the diamond norm distance ||U·U† - V·V†||_◇ of the channels of gates.
+
+    For unitary channels the usual upper bound 2 sqrt(1 - F_pro) is tight: the eigenvalues of U†V (in SU(2))
+    are e^(±iθ/2), and the distance of their chord from 0 is c = |tr(U†V)| / 2, so the distance is 2 sqrt(1 - c^2).
+
+    Args:
+        a (Gate | GateBatch | np.ndarray): The first gate(s).
+        b (Gate | GateBatch | np.ndarray): The second gate(s).
+
+    Returns:
+        float | np.ndarray: The diamond distance (or the distances of the batch), in [0, 2].
+    """
+
+    return _result(2 * np.sqrt(1 - _gate_overlaps(a, b) ** 2))
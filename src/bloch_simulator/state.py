@@ -1,5 +1,21 @@
 from typing import Self
 import numpy as np
+from bloch_simulator.measurement import sample_counts
+
+
+def _read_only(vector: np.ndarray) -> np.ndarray:
+    vector = np.array(vector, dtype=complex)
+    vector.flags.writeable = False
+    return vector
+
+
+# canonical vectors of the named states, shared by every State created by name
+NAMED_STATES = {
+    "0": _read_only([1, 0]),
+    "1": _read_only([0, 1]),
+    "+": _read_only([np.sqrt(0.5), np.sqrt(0.5)]),
+    "-": _read_only([np.sqrt(0.5), -np.sqrt(0.5)]),
+}
 
 
 class State:
@@ -7,6 +23,8 @@ class State:
     Class to represent a quantum state. It is represented by a column vector.
     """
 
+    __slots__ = ("_state",)
+
     def __init__(self, *args):
         """
         Create a new state.
@@ -18,14 +36,20 @@ class State:
                 - With another state.
                 - With two numbers, the state is a column vector with those numbers as amplitudes.
                 - With a string representing the name of the state: 0, 1, +, - (or |0>, |1>, |+>, |->).
+                  The vectors of the named states are shared and read-only.
 
         Raises:
             ValueError: If the arguments are invalid.
         """
-        if isinstance(args[0], State):
-            self._state = args[0].state.copy()
+        if len(args) > 0 and isinstance(args[0], State):
+            # read-only vectors are never mutated, so they can be shared
+            self._state = (
+                args[0].state
+                if not args[0].state.flags.writeable
+                else args[0].state.copy()
+            )
         elif args is None or len(args) == 0:
-            self._state = np.array([1, 0])
+            self._state = NAMED_STATES["0"]
         elif isinstance(args[0], np.ndarray):
             assert args[0].shape[0] == 2, "The state must be a column vector of size 2."
             self._state = args[0]
@@ -33,17 +57,17 @@ class State:
             assert (
                 args == 0 or args == 1
             ), "The state must be a column vector of size 2."
-            self._state = np.array([0, 1]) if args == 1 else np.array([1, 0])
+            self._state = NAMED_STATES["1"] if args == 1 else NAMED_STATES["0"]
         elif isinstance(args[0], str):
             match args[0]:
                 case "0" | "|0>":
-                    self._state = np.array([1, 0])
+                    self._state = NAMED_STATES["0"]
                 case "1" | "|1>":
-                    self._state = np.array([0, 1])
+                    self._state = NAMED_STATES["1"]
                 case "+" | "|+>":
-                    self._state = np.array([1 / np.sqrt(2), 1 / np.sqrt(2)])
+                    self._state = NAMED_STATES["+"]
                 case "-" | "|->":
-                    self._state = np.array([1 / np.sqrt(2), -1 / np.sqrt(2)])
+                    self._state = NAMED_STATES["-"]
                 case _:
                     raise ValueError("Invalid state name.")
         else:
@@ -104,6 +128,9 @@ class State:
         """
         Set the state.
 
+        The vector is stored by reference. It is only modified in place by Gate.apply_ (or Gate.apply with out),
+        which copies read-only vectors first, so shared read-only vectors stay intact.
+
         Args:
             new_state (np.ndarray): The new state.
         """
@@ -123,13 +150,49 @@ class State:
         Returns:
             np.ndarray[float]: The Bloch coordinates of the state in Cartesian coordinates.
         """
-        return np.array(
-            [
-                2 * np.real(self[1] * np.conj(self[0])),
-                2 * np.imag(self[1] * np.conj(self[0])),
-                np.abs(self[0]) ** 2 - np.abs(self[1]) ** 2,
-            ]
-        )
+        return self.get_bloch_coordinates()
+
+    def get_bloch_coordinates(self, out: np.ndarray | None = None) -> np.ndarray[float]:
+        """
+        Return the Bloch coordinates of the state in Cartesian coordinates, optionally written into a preallocated array.
+
+        Args:
+            out (np.ndarray | None): A float array of size 3 to write the coordinates into. Defaults to a new array.
+
+        Returns:
+            np.ndarray[float]: The Bloch coordinates (out, if it is given).
+        """
+        # Python scalars are much faster than numpy operations on 2 elements
+        alpha, beta = self._state.item(0), self._state.item(1)
+        product = beta * alpha.conjugate()
+
+        if out is None:
+            out = np.empty(3)
+
+        out[0] = 2 * product.real
+        out[1] = 2 * product.imag
+        out[2] = abs(alpha) ** 2 - abs(beta) ** 2
+
+        return out
+
+    def measure(
+        self,
+        basis: str | np.ndarray = "Z",
+        shots: int = 1024,
+        rng: np.random.Generator | int | None = None,
+    ) -> np.ndarray[int]:
+        """
+        Simulate measuring the state many times.
+
+        Args:
+            basis (str | np.ndarray): X, Y, Z or an arbitrary axis of the Bloch sphere. Defaults to Z.
+            shots (int): The number of measurements. Defaults to 1024.
+            rng (np.random.Generator | int | None): A generator or a seed, for reproducible results.
+
+        Returns:
+            np.ndarray[int]: The counts of the two outcomes (the first one is the state along the axis, e.g. |0> for Z).
+        """
+        return sample_counts(self.bloch_coordinates, basis, shots, rng)
 
     def __getitem__(self, index: int) -> complex:
         """
@@ -149,18 +212,16 @@ class State:
         return self._state[index]
 
     def __str__(self):
-        if np.allclose(self._state, np.array([1, 0]), atol=1e-4):
-            return "|0>"
-        elif np.allclose(self._state, np.array([0, 1]), atol=1e-4):
-            return "|1>"
-        elif np.allclose(
-            self._state, np.array([1 / np.sqrt(2), 1 / np.sqrt(2)]), atol=1e-4
-        ):
-            return "|+>"
-        elif np.allclose(
-            self._state, np.array([1 / np.sqrt(2), -1 / np.sqrt(2)]), atol=1e-4
+        """Return the name of the state if it is a named state (up to global phase), otherwise its amplitudes."""
+
+        bloch_coordinates = self.bloch_coordinates
+        entry = _NAMED_STATE_INDEX.get(_recognition_key(bloch_coordinates))
+
+        if (
+            entry is not None
+            and np.abs(bloch_coordinates - entry[0]).max() <= _RECOGNITION_TOLERANCE
         ):
-            return "|->"
+            return entry[1]
 
         return f"{self.alpha:.2f} |0> + {self.beta:.2f} |1>"
 
@@ -175,3 +236,24 @@ class State:
 
     def __repr__(self):
         return self.__str__()
+
+
+_RECOGNITION_DECIMALS = 2
+_RECOGNITION_TOLERANCE = 1e-4
+
+
+def _recognition_key(bloch_coordinates: np.ndarray) -> bytes:
+    return (
+        np.rint(bloch_coordinates * 10**_RECOGNITION_DECIMALS).astype(np.int8).tobytes()
+    )
+
+
+# maps the rounded Bloch vector of the named states to the exact vector and the name
+_NAMED_STATE_INDEX = {}
+
+for name, vector in NAMED_STATES.items():
+    bloch_coordinates = State(vector).bloch_coordinates
+    _NAMED_STATE_INDEX[_recognition_key(bloch_coordinates)] = (
+        bloch_coordinates,
+        f"|{name}>",
+    )
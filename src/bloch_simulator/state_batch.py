@@ -0,0 +1,180 @@
+from typing import Iterable, Self
+import numpy as np
+from bloch_simulator.state import State
+from bloch_simulator.measurement import sample_counts
+
+
+class StateBatch:
+    """
+    Class to represent a batch of quantum states. It is represented by an Nx2 complex array, where each row is a state.
+    """
+
+    def __init__(self, states: np.ndarray | Iterable[State] | Self):
+        """
+        Create a new batch of states.
+
+        Args:
+            states: The batch can be given in different ways:
+                - With a numpy array of shape Nx2.
+                - With another batch.
+                - With an iterable of State objects.
+
+        Raises:
+            ValueError: If the arguments are invalid.
+        """
+        if isinstance(states, StateBatch):
+            self._states = states.states.copy()
+        elif isinstance(states, np.ndarray):
+            assert (
+                states.ndim == 2 and states.shape[1] == 2
+            ), "The states must be an array of shape Nx2."
+            self._states = states
+        elif isinstance(states, Iterable):
+            states = list(states)
+            assert all(
+                isinstance(s, State) for s in states
+            ), "All elements must be State objects."
+            self._states = np.array([s.state for s in states], dtype=complex).reshape(
+                -1, 2
+            )
+        else:
+            raise ValueError("Invalid arguments.")
+
+    @property
+    def states(self) -> np.ndarray[complex]:
+        """
+        Return the states as an Nx2 array.
+
+        Returns:
+            np.ndarray: The states, one per row.
+        """
+        return self._states
+
+    def set_states(self, new_states: np.ndarray | Self):
+        """
+        Set the states.
+
+        The array is stored by reference. It is only modified in place by Gate.apply_ (or Gate.apply with out),
+        which copies read-only or non-complex arrays first.
+
+        Args:
+            new_states (np.ndarray | StateBatch): The new states, an array of shape Nx2 or another batch.
+        """
+        if isinstance(new_states, StateBatch):
+            self._states = new_states.states
+        else:
+            assert (
+                new_states.ndim == 2 and new_states.shape[1] == 2
+            ), "The states must be an array of shape Nx2."
+            self._states = new_states
+
+    @property
+    def alpha(self) -> np.ndarray[complex]:
+        """
+        Return the amplitudes of |0>.
+
+        Returns:
+            np.ndarray: The amplitudes of |0>, one per state.
+        """
+        return self._states[:, 0]
+
+    @property
+    def beta(self) -> np.ndarray[complex]:
+        """
+        Return the amplitudes of |1>.
+
+        Returns:
+            np.ndarray: The amplitudes of |1>, one per state.
+        """
+        return self._states[:, 1]
+
+    @property
+    def theta(self) -> np.ndarray[float]:
+        """
+        Return the angles of the states in the Bloch sphere.
+
+        Returns:
+            np.ndarray[float]: The angles of the states.
+        """
+        return 2 * np.arccos(np.clip(np.abs(self.alpha), 0, 1))
+
+    @property
+    def phi(self) -> np.ndarray[float]:
+        """
+        Return the phases of the states in the Bloch sphere.
+
+        Returns:
+            np.ndarray[float]: The phases of the states.
+        """
+        return np.angle(self.beta) - np.angle(self.alpha)
+
+    @property
+    def bloch_coordinates(self) -> np.ndarray[float]:
+        """
+        Return the Bloch coordinates of the states in Cartesian coordinates.
+
+        Returns:
+            np.ndarray[float]: An Nx3 array, each row is the Bloch vector of a state.
+        """
+        alpha = self.alpha
+        beta = self.beta
+        off_diagonal = beta * np.conj(alpha)
+
+        coordinates = np.empty((len(self), 3))
+        coordinates[:, 0] = 2 * off_diagonal.real
+        coordinates[:, 1] = 2 * off_diagonal.imag
+        coordinates[:, 2] = np.abs(alpha) ** 2 - np.abs(beta) ** 2
+
+        return coordinates
+
+    def measure(
+        self,
+        basis: str | np.ndarray = "Z",
+        shots: int = 1024,
+        rng: np.random.Generator | int | None = None,
+    ) -> np.ndarray[int]:
+        """
+        Simulate measuring every state of the batch many times.
+
+        Args:
+            basis (str | np.ndarray): X, Y, Z or an arbitrary axis of the Bloch sphere. Defaults to Z.
+            shots (int): The number of measurements. Defaults to 1024.
+            rng (np.random.Generator | int | None): A generator or a seed, for reproducible results.
+
+        Returns:
+            np.ndarray[int]: An Nx2 array, the counts of the two outcomes for each state.
+        """
+        return sample_counts(self.bloch_coordinates, basis, shots, rng)
+
+    def __len__(self) -> int:
+        return self._states.shape[0]
+
+    def __getitem__(self, index: int) -> State:
+        """
+        Return a single state of the batch.
+
+        Args:
+            index (int): The index of the state to return.
+
+        Returns:
+            State: The state at the given index.
+        """
+        return State(self._states[index])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, StateBatch):
+            return False
+
+        return self._states.shape == value.states.shape and np.allclose(
+            self._states, value.states
+        )
+
+    def __str__(self):
+        return f"StateBatch({len(self)} states)"
+
+    def __repr__(self):
+        return self.__str__()
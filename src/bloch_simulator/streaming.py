@@ -0,0 +1,210 @@
+"""
+Bloch trajectories of states through very long gate sequences, computed chunk by chunk with bounded memory.
+
+The gates can come from any iterable, from an array (or a batch), or from a file: a .npy file of shape Mx2x2,
+which is memory-mapped, or a text file with one gate per line, either a name (H) or the four entries of the matrix
+row by row (0 1 1 0). Empty lines and lines starting with # are skipped.
+
+The chunks are applied with bloch_simulator.evolution.stream_running_products: within a chunk, the running products
+of the gates are computed with a parallel prefix scan, and only the product of the whole chunk is carried over to the next one.
+"""
+
+import os
+from itertools import islice
+from typing import Iterable, Iterator
+import numpy as np
+from bloch_simulator.evolution import stream_running_products
+from bloch_simulator.gate import Gate
+from bloch_simulator.gate_batch import GateBatch
+from bloch_simulator.state import State
+from bloch_simulator.state_batch import StateBatch
+
+GateSource = Iterable[Gate | np.ndarray] | GateBatch | np.ndarray | str | os.PathLike
+
+
+def read_gates(path: str | os.PathLike, chunk_size: int = 4096) -> Iterator[np.ndarray]:
+    """Read the gates of a file in chunks, so that the file does not need to fit in memory.
+
+    Args:
+        path (str | os.PathLike): A .npy file of shape Mx2x2, or a text file with one gate per line (see the module).
+        chunk_size (int): The number of gates per chunk. Defaults to 4096.
+
+    Raises:
+        ValueError: If a line of a text file cannot be parsed.
+
+    Yields:
+        np.ndarray: The matrices of the gates, of shape chunk_size x 2 x 2 (the last chunk can be shorter).
+    """
+
+    assert chunk_size > 0, "The chunk size must be positive."
+
+    if os.fspath(path).endswith(".npy"):
+        yield from _array_chunks(np.load(path, mmap_mode="r"), chunk_size)
+        return
+
+    with open(path, encoding="utf-8") as file:
+        chunk = []
+
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+
+            if line == "" or line.startswith("#"):
+                continue
+
+            try:
+                chunk.append(_parse_gate(line))
+            except (ValueError, AssertionError) as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+
+            if len(chunk) == chunk_size:
+                yield np.array(chunk)
+                chunk = []
+
+        if len(chunk) > 0:
+            yield np.array(chunk)
+
+
+def _parse_gate(line: str) -> np.ndarray:
+    entries = line.split()
+
+    if len(entries) == 1:
+        return Gate(entries[0]).U
+
+    assert len(entries) == 4, "A gate is a name or the four entries of its matrix."
+
+    return np.array([complex(entry) for entry in entries]).reshape(2, 2)
+
+
+def _array_chunks(matrices: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    assert (
+        matrices.ndim == 3 and matrices.shape[1:] == (2, 2)
+    ), "The matrices must be an array of shape Mx2x2."
+
+    for start in range(0, matrices.shape[0], chunk_size):
+        # only the chunk is read from a memory-mapped file
+        yield np.asarray(matrices[start : start + chunk_size], dtype=complex)
+
+
+def _matrix_chunks(gates: GateSource, chunk_size: int) -> Iterator[np.ndarray]:
+    if isinstance(gates, (str, os.PathLike)):
+        yield from read_gates(gates, chunk_size)
+    elif isinstance(gates, GateBatch):
+        yield from _array_chunks(gates.matrices, chunk_size)
+    elif isinstance(gates, np.ndarray):
+        yield from _array_chunks(gates, chunk_size)
+    else:
+        iterator = iter(gates)
+
+        while chunk := list(islice(iterator, chunk_size)):
+            yield np.array(
+                [gate.U if isinstance(gate, Gate) else gate for gate in chunk],
+                dtype=complex,
+            ).reshape(-1, 2, 2)
+
+
+def stream_trajectory(
+    gates: GateSource,
+    states: State | StateBatch,
+    chunk_size: int = 4096,
+    stride: int = 1,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Apply a sequence of gates to states one after the other, and stream the Bloch vectors after every gate.
+
+    Only one chunk of gates is held in memory at a time, so the sequence can be far longer than what fits in memory.
+
+    Args:
+        gates (Iterable[Gate | np.ndarray] | GateBatch | np.ndarray | str | os.PathLike): The gates in the order they are applied,
+            as an iterable of gates (or matrices), a batch, an array of shape Mx2x2 or the path of a file (see read_gates).
+        states (State | StateBatch): The initial state(s).
+        chunk_size (int): The number of gates processed together. Defaults to 4096.
+        stride (int): Only the Bloch vectors after every stride-th gate are returned. Defaults to 1.
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: The numbers of gates applied at the kept steps (shape m) and the Bloch vectors
+            of the states after those steps (shape m x N x 3).
+    """
+
+    assert chunk_size > 0 and stride > 0, "The chunk size and stride must be positive."
+
+    return stream_running_products(_matrix_chunks(gates, chunk_size), states, stride)
+
+
+def save_trajectory(
+    gates: GateSource,
+    states: State | StateBatch,
+    path: str | os.PathLike,
+    n_gates: int | None = None,
+    chunk_size: int = 4096,
+    stride: int = 1,
+    dtype: np.dtype = np.float32,
+) -> np.memmap:
+    """Write the Bloch trajectory of stream_trajectory into a memory-mapped .npy file, which can be larger than the memory.
+
+    Args:
+        gates (Iterable[Gate | np.ndarray] | GateBatch | np.ndarray | str | os.PathLike): The gates, see stream_trajectory.
+        states (State | StateBatch): The initial state(s).
+        path (str | os.PathLike): The .npy file to write.
+        n_gates (int | None): The number of gates. Defaults to the length of the gates (or of the .npy file),
+            it is required for other files and iterables without a length.
+        chunk_size (int): The number of gates processed together. Defaults to 4096.
+        stride (int): Only the Bloch vectors after every stride-th gate are written. Defaults to 1.
+        dtype (np.dtype): The type of the coordinates in the file. Defaults to float32.
+
+    Raises:
+        ValueError: If the number of gates is not n_gates.
+
+    Returns:
+        np.memmap: The Bloch vectors in the file, of shape (n_gates // stride) x N x 3.
+    """
+
+    assert chunk_size > 0 and stride > 0, "The chunk size and stride must be positive."
+
+    if n_gates is None:
+        n_gates = _count_gates(gates)
+
+    n_states = len(states) if isinstance(states, StateBatch) else 1
+    out = np.lib.format.open_memmap(
+        path, mode="w+", dtype=dtype, shape=(n_gates // stride, n_states, 3)
+    )
+    # the gates after the last kept step do not show up in the trajectory, so they are counted as they are read
+    consumed = 0
+
+    def counted_chunks() -> Iterator[np.ndarray]:
+        nonlocal consumed
+
+        for matrices in _matrix_chunks(gates, chunk_size):
+            consumed += len(matrices)
+
+            if consumed > n_gates:
+                raise ValueError(f"There are more than {n_gates} gates.")
+
+            yield matrices
+
+    written = 0
+
+    for steps, bloch_vectors in stream_running_products(counted_chunks(), states, stride):
+        out[written : written + len(steps)] = bloch_vectors
+        written += len(steps)
+
+    if consumed != n_gates:
+        raise ValueError(f"There are fewer than {n_gates} gates.")
+
+    out.flush()
+
+    return out
+
+
+def _count_gates(gates: GateSource) -> int:
+    if isinstance(gates, (str, os.PathLike)):
+        assert os.fspath(gates).endswith(
+            ".npy"
+        ), "The number of gates is required for a text file."
+
+        return np.load(gates, mmap_mode="r").shape[0]
+
+    if isinstance(gates, GateBatch):
+        return gates.matrices.shape[0]
+
+    assert hasattr(gates, "__len__"), "The number of gates is required for an iterator."
+
+    return len(gates)